@@ -0,0 +1,152 @@
+"""
+Checks the results from FeedbackKernel against a plain two pass scorer, and the words LetterIndex.match finds
+against checking every word, run with python -m pytest
+"""
+
+import random
+from collections import Counter
+
+import pytest
+
+import wordle
+
+# Words with lots of repeated letters, where greens have to be taken out before the yellows are given out
+REPEATED_LETTER_WORDS = ["ABBEY", "BOBBY", "EERIE", "SPEED", "ALLOT", "LLAMA", "LEVEL", "GEESE", "EMBER", "ERASE",
+                         "SASSY", "MAMMA", "BABES", "ABACK", "KEBAB", "TATTY", "OTTER", "TREES", "STEER", "RESET"]
+
+
+def two_pass_result(guess, wordle_word):
+    """Scores a guess the standard way: greens first, then yellows from left to right while the letter is left over"""
+    result = [-1] * len(guess)
+    left_over = Counter()
+
+    for letter_index, (guess_letter, wordle_letter) in enumerate(zip(guess, wordle_word)):
+        if guess_letter == wordle_letter:
+            result[letter_index] = 1
+        else:
+            left_over[wordle_letter] += 1
+
+    for letter_index, guess_letter in enumerate(guess):
+        if result[letter_index] != 1 and left_over[guess_letter]:
+            result[letter_index] = 0
+            left_over[guess_letter] -= 1
+
+    return result
+
+
+def sample_words(length, count, seed):
+    """Returns some of the words of a length from the word list, always the same ones for a seed"""
+    words = wordle.get_lexicon().words(length)
+    return random.Random(seed).sample(words, min(count, len(words)))
+
+
+def test_bobby_against_abbey():
+    assert two_pass_result("BOBBY", "ABBEY") == [0, -1, 1, -1, 1]
+    assert wordle.WordleGame("ABBEY").guess("BOBBY") == [0, -1, 1, -1, 1]
+
+    kernel = wordle.FeedbackKernel(["ABBEY"])
+    assert wordle.decode_pattern(kernel.codes("BOBBY")[0], 5) == [0, -1, 1, -1, 1]
+
+
+def test_kernel_repeated_letters():
+    kernel = wordle.FeedbackKernel(REPEATED_LETTER_WORDS)
+
+    for guess in REPEATED_LETTER_WORDS:
+        results = [wordle.decode_pattern(code, 5) for code in kernel.codes(guess)]
+        assert results == [two_pass_result(guess, wordle_word) for wordle_word in REPEATED_LETTER_WORDS], guess
+
+
+@pytest.mark.parametrize("length", [4, 5, 6, 8])
+def test_kernel_matches_two_pass(length):
+    wordles = sample_words(length, 300, length)
+    guesses = sample_words(length, 40, length + 100)
+    kernel = wordle.FeedbackKernel(wordles)
+
+    for guess in guesses:
+        codes = kernel.codes(guess)
+        for wordle_word, code in zip(wordles, codes):
+            assert code == wordle.encode_result(two_pass_result(guess, wordle_word)), (guess, wordle_word)
+
+
+def test_kernel_typecodes_agree():
+    wordles = sample_words(5, 200, 1) + REPEATED_LETTER_WORDS
+    kernels = [wordle.FeedbackKernel(wordles, typecode) for typecode in ("B", "H", "I", "Q")]
+
+    for guess in sample_words(5, 20, 2) + REPEATED_LETTER_WORDS:
+        assert len({tuple(kernel.codes(guess)) for kernel in kernels}) == 1, guess
+
+
+def test_letter_index_match_repeated_letters():
+    index = wordle.LetterIndex(REPEATED_LETTER_WORDS)
+
+    for wordle_word in REPEATED_LETTER_WORDS:
+        for guess in REPEATED_LETTER_WORDS:
+            result = two_pass_result(guess, wordle_word)
+            hints = wordle.Constraints(5).update(guess, result)
+
+            expected = [word for word in REPEATED_LETTER_WORDS if two_pass_result(guess, word) == result]
+            assert index.words_of(index.match(hints)) == expected, (guess, wordle_word)
+
+
+def test_letter_index_match_impossible_position():
+    words = wordle.get_lexicon().words(5)
+    index = wordle.get_letter_index(5, words)
+
+    # The Z has to be first after ZEBRA and can't be first after ZONKS, so nothing can go in the first position
+    history = [("ZEBRA", [1, -1, -1, -1, -1]), ("ZONKS", [0, -1, -1, -1, -1])]
+    hints = wordle.Constraints(5)
+    for guess, result in history:
+        hints = hints.update(guess, result)
+
+    assert hints.allowed[0] == 0
+    assert index.match(hints) == 0
+    assert [word for word in words if hints.matches(word)] == []
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_letter_index_match_filters_like_brute_force(seed):
+    rng = random.Random(seed)
+    length = rng.choice([4, 5, 6])
+    words = wordle.get_lexicon().words(length)
+    index = wordle.get_letter_index(length, words)
+
+    wordle_word = rng.choice(words)
+    hints = wordle.Constraints(length)
+    history = []
+
+    for _ in range(3):
+        guess = rng.choice(words)
+        result = two_pass_result(guess, wordle_word)
+        hints = hints.update(guess, result)
+        history.append((guess, result))
+
+        expected = [word for word in words
+                    if all([two_pass_result(past_guess, word) == past_result for past_guess, past_result in history])]
+
+        mask = index.match(hints)
+        assert index.words_of(mask) == expected, history
+        assert wordle_word in expected
+        assert [word for word in words if hints.matches(word)] == expected, history
+
+
+def test_lookahead_table_depends_on_pool():
+    player = wordle.WordlePlayer(5)
+    player.narrow_possible_wordles("LARES", [-1, 0, -1, -1, 1])
+    patterns = player.get_patterns(False)
+
+    # A search that has been used with another pool has to give the same answer as a new one
+    search = wordle.LookaheadSearch(patterns)
+    search.best_guess(player.possible_wordles, [], 1)
+    used = search.best_guess(player.possible_wordles, ["BUMPH", "PYGMY"], 1)
+
+    assert used == wordle.LookaheadSearch(patterns).best_guess(player.possible_wordles, ["BUMPH", "PYGMY"], 1)
+
+
+def test_pattern_matrix_unwritable_file(monkeypatch, tmp_path):
+    words = sample_words(5, 50, 3)
+    monkeypatch.setattr(wordle, "_pattern_matrices", {})
+    monkeypatch.setattr(wordle, "PATTERN_MATRIX_FILE", str(tmp_path / "missing" / "PatternMatrix{}.bin"))
+
+    # The table can't be saved, so there is no table and the words are scored without one
+    assert wordle.get_pattern_matrix(5, words, print_progress=False) is None
+    assert list(tmp_path.iterdir()) == []
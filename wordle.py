@@ -13,11 +13,24 @@ Info:
     Yellow: This letter appers in the word, but it is not in the correct place
     Grey: This letter doesn't apper in the word
 """
+import contextlib
+import hashlib
+import heapq
 import itertools
 import math
+import mmap
+import os
 import random
+import struct
+import sys
 import time
 import json
+from array import array
+from collections import Counter, OrderedDict, deque
+from operator import itemgetter
+
+# argparse, asyncio, concurrent.futures and re are slow to import and only some commands need them, so they are
+# imported where they are used, to keep a command like suggest quick to start
 
 
 class WordleGame:
@@ -25,37 +38,41 @@ class WordleGame:
 
     def __init__(self, wordle=None):
         if wordle:
-            wordle = wordle.upper()
-            self.wordle = wordle
-            self.length = len(self.wordle)
+            self.set_wordle(wordle.upper())
 
     def set_wordle(self, wordle):
         """Sets the wordle to the input value"""
         self.wordle = wordle
         self.length = len(self.wordle)
+        self.kernel = FeedbackKernel([self.wordle.upper()])
 
     def guess(self, guess):
         """
         Returns the result of guessing a word
-        Returns a list where a value of 1 is green, 0 is yellow, and -1 is Grey
+        Returns a list where a value of 1 is green, 0 is yellow, and -1 is Grey. A letter that is guessed more times
+        then it is in the wordle is only coloured as many times as it is in the wordle, greens first
         """
         if len(guess) != self.length:
             return False
 
-        guess = guess.upper()
+        return decode_pattern(self.kernel.codes(guess)[0], self.length)
 
-        output = [0 for i in range(self.length)]
-        for letter_index, letter in enumerate(guess):
-            if letter == self.wordle[letter_index]:
-                output[letter_index] = 1
 
-            elif letter in self.wordle:
-                output[letter_index] = 0
+# Ruffly how much better knowing n letters is compared to knowing 0 letters, used by expected
+LETTER_NUMER_COMPASON = {0: 1.0, 1: 3.4969000078182506, 2: 14.637312414916163,
+                         3: 86.66175819389429, 4: 1349.5147462302787, 5: 25000}
 
-            else:
-                output[letter_index] = -1
 
-        return output
+def letter_number_comparison(letter_number):
+    """
+    Returns ruffly how much better knowing a number of letters is compared to knowing 0 letters. Past the 5 letters
+    in LETTER_NUMER_COMPASON, each extra letter is taken to be as much better as the 5th letter was then the 4th
+    """
+    if letter_number in LETTER_NUMER_COMPASON:
+        return LETTER_NUMER_COMPASON[letter_number]
+
+    ratio = LETTER_NUMER_COMPASON[5] / LETTER_NUMER_COMPASON[4]
+    return LETTER_NUMER_COMPASON[5] * ratio ** (letter_number - 5)
 
 
 def expected(input_list):
@@ -74,526 +91,2184 @@ def expected(input_list):
     word, it is a wighted avrige, such that values with higher number of letters in the word get much lower scores
 
     The LETTER_NUMER_COMPASON dictionary is ruffly how much better knowing n letters is compared to knowing 0 letters.
-    Calculated with 5 letter wordles.
-    Will currently crash if the number of letters in the wordle is greater then 5
+    Calculated with 5 letter wordles, and carried on past 5 letters by letter_number_comparison.
     """
-    LETTER_NUMER_COMPASON = {0: 1.0, 1: 3.4969000078182506, 2: 14.637312414916163,
-                             3: 86.66175819389429, 4: 1349.5147462302787, 5: 25000}
-
-    return sum([x ** 2 / sum(input_list) * (1 / LETTER_NUMER_COMPASON[str(bin(i)).count('1')])
+    return sum([x ** 2 / sum(input_list) * (1 / letter_number_comparison(str(bin(i)).count('1')))
                 for i, x in enumerate(input_list)])
 
 
-class WordlePlayer:
-    """
-    Contain the methods to calculate the best guess given some information
-    This serves as the back end of the system
+def letter_superset_counts(letter_sets, max_letters):
     """
+    Counts how many words contain each set of letters, for every set of up to max_letters letters that is in at least
+    one word. The words are given as the 26 bit sets of their letters, from LetterIndex.letter_sets_of, and the sets
+    of letters counted are 26 bit sets made from letter_bit.
 
-    def __init__(self, length):
-        self.length = length
+    Each word only adds to the sets made from its own letters, so this is much quicker then checking every word
+    against every set of letters
+    """
+    counts = Counter()
+    for letter_set, count in Counter(letter_sets).items():
+        bits = [1 << i for i in range(letter_set.bit_length()) if letter_set >> i & 1]
+        for size in range(min(max_letters, len(bits)) + 1):
+            for subset in itertools.combinations(bits, size):
+                counts[sum(subset)] += count
 
-        self.best_start_word = "LARES"
+    return counts
 
-        self.possible_words = []
-        with open("words.txt") as txt:
-            for line in txt.readlines():
-                line = line.strip("\n")
-                if len(line) == self.length:
-                    self.possible_words.append(line)
 
-        self.possible_wordles = self.possible_words[:]
+def exact_counts(superset_counts, letter_bits):
+    """
+    Returns the grouping list used by expected for a set of letters, from letter_superset_counts. Index i is the
+    number of words that contain exactly the letters from letter_bits that are in the binary of i.
 
-        self.game = WordleGame()
+    The counts of words containing at least each subset of the letters are turned into counts of words containing
+    exactly each subset, by taking away the words that contain one more letter, once for each letter
+    """
+    subsets = [0]
+    for bit in letter_bits:
+        subsets += [subset | bit for subset in subsets]
 
-        # The letters that it could be in each position
-        self.hints = {"Green": [],
-                      "Yellow": [],
-                      "Grey": []}
+    grouping = [superset_counts.get(subset, 0) for subset in subsets]
 
-    def update_hints(self, guess, result, hints=None):
-        """
-        Adds the information gained from the result of a guess and result and adds this to the hints. Modifies the
-        hints in place.
-        """
-        guess = guess.upper()
+    size = len(grouping)
+    step = 1
+    while step < size:
+        for start in range(0, size, 2 * step):
+            for i in range(start, start + step):
+                grouping[i] -= grouping[i + step]
+        step *= 2
 
-        if hints is None:
-            hints = self.hints
+    return grouping
 
-        for letter_index, letter in enumerate(guess):
-            if result[letter_index] == 1:
-                to_add = (letter, letter_index)
-                if to_add not in hints["Green"]:
-                    hints["Green"].append(to_add)
 
-            elif result[letter_index] == 0:
-                to_add = (letter, letter_index)
-                if to_add not in hints["Yellow"]:
-                    hints["Yellow"].append(to_add)
+class SolverStats:
+    """
+    Counts how many times the busy parts of the solver run and times how long each part takes, so it can be seen
+    where the time goes. Counters are things like the number of results worked out, hint updates, filters of the
+    possible wordles and cache hits, and timers are the phases of get_best_guesses and the scoring passes.
 
-            else:
-                if letter not in [item[0] for item in hints["Green"] + hints["Yellow"]] + hints["Grey"]:
-                    hints["Grey"].append(letter)
+    One is shared by everything in a process, from get_stats
+    """
 
-    def is_match(self, wordle, hints=None):
-        """Returns True if the wordle guess matches the hints. If hints is set to None, then the self.hints is used"""
-        if hints is None:
-            hints = self.hints
+    def __init__(self):
+        self.counters = Counter()
+        self.timers = {}
 
-        matching = True
-
-        for colour, letters in hints.items():
-            if colour == "Green":
-                i = 0
-                while matching and i < len(letters):
-                    letter, letter_index = letters[i]
-                    matching = wordle[letter_index] == letter
-                    i += 1
-
-            if colour == "Yellow":
-                i = 0
-                while matching and i < len(letters):
-                    letter, letter_index = letters[i]
-                    matching = letter in wordle and wordle[letter_index] != letter
-                    i += 1
-
-            if colour == "Grey":
-                i = 0
-                while matching and i < len(letters):
-                    matching = letters[i] not in wordle
-                    i += 1
-
-            if matching is False:
-                return False
+    def count(self, name, amount=1):
+        """Adds to a counter"""
+        self.counters[name] += amount
 
-        return matching
+    def add_time(self, name, seconds):
+        """Adds a number of seconds to a timer, and counts one call"""
+        calls, total = self.timers.get(name, (0, 0.0))
+        self.timers[name] = (calls + 1, total + seconds)
 
-    def possible_wordle_count(self, hints=None):
-        """Returns the number of wordles from the possible wordle list that match the hints"""
+    @contextlib.contextmanager
+    def timer(self, name):
+        """Times the code in a with block, adding it to a timer"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
 
-        if hints is None:
-            hints = self.hints
+    def snapshot(self):
+        """Returns a dictionary of the counters and timers, which can be saved as json"""
+        return {
+            "counters": dict(self.counters),
+            "timers": {name: {"calls": calls, "seconds": seconds} for name, (calls, seconds) in self.timers.items()}
+        }
 
-        count = 0
-        matching_wordles = []
+    def reset(self):
+        """Sets every counter and timer back to 0"""
+        self.counters.clear()
+        self.timers.clear()
 
-        for wordle in self.possible_wordles:
-            if self.is_match(wordle, hints):
-                count += 1
-                matching_wordles.append(wordle)
 
-        return count, matching_wordles
+_stats = SolverStats()
 
-    def possible_wordle_count_v2(self, hints=None):
-        """A faster version of the possible_wordle_count function"""
-        if hints is None:
-            hints = self.hints
 
-        matching_wordles = self.possible_wordles[:]
+def get_stats():
+    """Returns the SolverStats shared by everything in this process"""
+    return _stats
 
-        for letter in hints["Green"]:
-            matching_wordles = [wordle for wordle in matching_wordles if wordle[letter[1]] == letter[0]]
 
-        for letter in hints["Yellow"]:
-            matching_wordles = [wordle for wordle in matching_wordles
-                                if letter[0] in wordle and wordle[letter[1]] != letter[0]]
+def print_progress_message(message, fraction=None):
+    """The default progress callback, which prints the message"""
+    print(message)
 
-        yellow_letters = [letter[0] for letter in hints["Yellow"] + hints["Green"]]
-        for letter in hints["Grey"]:
-            matching_wordles = [wordle for wordle in matching_wordles
-                                if letter not in wordle and letter not in yellow_letters]
 
-        return len(matching_wordles), matching_wordles
+# The function every progress message is given to, set by set_progress_callback
+_progress_callback = print_progress_message
 
-    def get_rand_word(self):
-        """Returns a random word from the possible word list"""
-        return random.choice(self.possible_words)
 
-    def analise(self, print_progress=True):
-        """
-        Analyses all possible guesses and calculates the average number of wordles each guess narrows it down to.
-        The time it takes to execute this function is proportional to len(self.possible_words) *
-        len(self.possible_wordles) ** 2. This is about 2 * 10 ** 12 for 5 letters with no information.
+def set_progress_callback(callback):
+    """
+    Sets the function that is called with the progress of long tasks, instead of printing it. It is called with a
+    message, and how much of the task is done from 0 to 1, or None if that isn't known. None goes back to printing
+    """
+    global _progress_callback
+    _progress_callback = print_progress_message if callback is None else callback
 
-        As this function takes too long to execute with a reasonably large pool of possible wordles, if the function
-        will take three minutes or more to execute, then it returns an empty dictionary
 
-        If print_progress is set then the function prints the % of how much it's done every 5 seconds
+def report_progress(message, fraction=None):
+    """Gives the progress of a long task to the progress callback"""
+    _progress_callback(message, fraction)
 
-        Returns a dictionary
-        """
 
-        # Returns the base case when no information is known
-        if len(self.possible_wordles) == len(self.possible_words) and self.length == 5:
-            return self.best_start_word
+@contextlib.contextmanager
+def profiling(filename):
+    """Profiles the code in a with block with cProfile, saving the profile to a file that pstats can read"""
+    import cProfile
 
-        random.shuffle(self.possible_wordles)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(filename)
 
-        guesses = {word: [] for word in self.possible_words}
 
-        hints_copy = {key: value[:] for key, value in self.hints.items()}
+# The word list and the files built from it are kept next to this file, so it can be run from any directory
+DATA_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
 
-        t = start_time = time.time()
-        for wordle_index, wordle in enumerate(self.possible_wordles):
-            self.game.set_wordle(wordle)
-            for i, word in enumerate(self.possible_words):
+WORDS_FILE = "words.txt"
+LEXICON_FILE = "Words{}.bin"
 
-                self.update_hints(word, self.game.guess(word), hints_copy)
+# The words that can be the wordle, one per line, optionally followed by how likely it is. If there is no file then
+# every word can be the wordle, and they are all as likely
+ANSWERS_FILE = "answers.txt"
 
-                guesses[word].append(self.possible_wordle_count_v2(hints_copy)[0])
+# The Lexicon shared by every player, made by get_lexicon
+_lexicon = None
 
-                hints_copy = {key: value[:] for key, value in self.hints.items()}
 
-                if print_progress and t + 5 < time.time():
-                    t = time.time()
-                    fraction_done = (wordle_index + i / len(self.possible_words)) / len(self.possible_wordles)
+def data_path(filename):
+    """Returns the path of a data file in DATA_DIRECTORY. A full path is left as it is"""
+    return os.path.join(DATA_DIRECTORY, filename)
 
-                    if (1 / fraction_done) * (t - start_time) > 180:
-                        return {}
 
-                    print(f"{round(fraction_done * 100, 1)}% Done")
+class Lexicon:
+    """
+    All the words from the word list, split up by length. The word list is only read once, and each player is given
+    the same list for its length rather then reading the file again. These lists are shared so must not be modified.
 
-        guesses_with_scores = {guess: sum(result) / len(result) for guess, result in guesses.items()}
+    The words of one length can also be saved to a binary file, which is much faster to load then the whole word
+    list. It is only used if the word list hasn't changed since it was saved.
+    """
 
-        return guesses_with_scores
+    MAGIC = b"WLX1"
+    # magic, word length, number of words, size of the word list, time the word list was modified
+    HEADER = struct.Struct("<4sHIQQ")
+
+    def __init__(self, filename=WORDS_FILE, answers_filename=ANSWERS_FILE):
+        self.filename = data_path(filename)
+        self.words_by_length = {}
+        self.read_all = False
+
+        self.answers_filename = data_path(answers_filename)
+        self.answers_by_length = None
+
+    def source_stamp(self):
+        """Returns the size and modified time of the word list, used to tell if a binary file is out of date"""
+        stat = os.stat(self.filename)
+        return stat.st_size, stat.st_mtime_ns
+
+    def read_words(self):
+        """Reads the whole word list, and splits it up by length"""
+        words_by_length = {}
+        with open(self.filename) as txt:
+            for line in txt.read().split("\n"):
+                if line:
+                    words_by_length.setdefault(len(line), []).append(line)
+
+        # Lengths that were loaded from a binary file keep the same list, as players may already be using it
+        words_by_length.update(self.words_by_length)
+        self.words_by_length = words_by_length
+        self.read_all = True
+
+    def read_binary(self, length):
+        """Returns the words of a length from its binary file, or None if there isn't one or it is out of date"""
+        try:
+            with open(data_path(LEXICON_FILE.format(length)), "rb") as file:
+                data = file.read()
+
+        except FileNotFoundError:
+            return None
+
+        if len(data) < self.HEADER.size:
+            return None
+
+        magic, word_length, count, source_size, source_mtime = self.HEADER.unpack_from(data)
+        if magic != self.MAGIC or word_length != length or (source_size, source_mtime) != self.source_stamp():
+            return None
+
+        text = data[self.HEADER.size:].decode("ascii")
+        if len(text) != count * length:
+            return None
+
+        return [text[i:i + length] for i in range(0, len(text), length)]
+
+    def save_binary(self, length):
+        """Saves the words of a length to its binary file"""
+        words = self.words(length)
+        header = self.HEADER.pack(self.MAGIC, length, len(words), *self.source_stamp())
+        write_bytes_to_file(data_path(LEXICON_FILE.format(length)), header + "".join(words).encode("ascii"))
+
+    def words(self, length):
+        """Returns the list of words of a length, loading them the first time they are needed"""
+        if length not in self.words_by_length and not self.read_all:
+            words = self.read_binary(length)
+            if words is None:
+                self.read_words()
+            else:
+                self.words_by_length[length] = words
 
-    def narrow_possible_wordles(self, guess, result):
-        """
-        Modifies the known hints to include the results from this guess. result input takes the format of the output
-        of the WordleGame.guess output; in the format of a list of ints where -1 is Grey, 0 is Yellow, and 1 is Green
-        """
-        self.update_hints(guess, result)
-        self.possible_wordles = [wordle for wordle in self.possible_wordles if self.is_match(wordle)]
+        return self.words_by_length.setdefault(length, [])
 
-    def analise_quick_section(self, letter_num=5, print_progress=True):
+    def answers(self, length):
         """
-        Returns a given number of sets of letters, with a score.
-        At the moment it returns top 1000 letter combinations
-
-        The number of letters in the letter combos are specified by the letter_num input.
+        Returns a dictionary of the words of a length that can be the wordle, to how likely each one is, from the
+        answers file. Words without a weight have a weight of 1. Returns None if there is no answers file, or it has
+        no words of this length, in which case every word can be the wordle
         """
-        good_letters = [((), 100000)]
-        start = t = time.time()
+        if self.answers_by_length is None:
+            if not os.path.exists(self.answers_filename):
+                return None
 
-        # Returns the base case where the guess is the first guess, which will take a long time so is pre-computed
-        if self.possible_words == self.possible_wordles and self.length == 5:
-            return self.best_start_word
+            self.answers_by_length = {}
+            with open(self.answers_filename) as txt:
+                for line in txt.read().split("\n"):
+                    parts = line.split()
+                    if parts:
+                        word = parts[0].upper()
+                        weight = float(parts[1]) if len(parts) > 1 else 1.0
+                        self.answers_by_length.setdefault(len(word), {})[word] = weight
 
-        for letters_index, letters in enumerate(itertools.combinations("QWERTYUIOPASDFGHJKLZXCVBNM", letter_num)):
-            grouping = [0] * 2 ** letter_num
-            for wordle in self.possible_wordles:
-                grouping_index = 0
+        return self.answers_by_length.get(length)
 
-                for index, letter in enumerate(letters):
-                    if letter in wordle:
-                        grouping_index += 2 ** index
 
-                grouping[grouping_index] += 1
+def get_lexicon():
+    """Returns the Lexicon shared by every player"""
+    global _lexicon
+    if _lexicon is None:
+        _lexicon = Lexicon()
 
-            score = expected(grouping)
+    return _lexicon
 
-            # If any of the letters are green, then this score should be lowered
-            for letter in letters:
-                if letter in [l[0] for l in self.hints["Green"]]:
-                    score /= 1.5
 
-            if score < good_letters[-1][1]:
-                good_letters.append((letters, score))
-                good_letters.sort(key=lambda x: x[1])
-                good_letters = good_letters[:1000]
+PATTERN_MATRIX_FILE = "PatternMatrix{}.bin"
 
-            if t + 5 < time.time():
-                t = time.time()
+# Pattern matrices bigger then this are not built, and the slower analysis is used instead
+PATTERN_MATRIX_MAX_BYTES = 2 ** 30
 
-                total = math.factorial(26) / math.factorial(26 - letter_num) / math.factorial(letter_num)
+# Pattern matrices that have been opened, by word length. None if the length is too big to have one
+_pattern_matrices = {}
 
-                fraction_done = letters_index / total
 
-                if (1 / fraction_done) * (t - start) > 60:
-                    return []
+def encode_result(result):
+    """
+    Turns a result in the format of the WordleGame.guess output into a single number. Each tile is a base 3 digit,
+    where 0 is Grey, 1 is Yellow and 2 is Green, and the first tile is the least significant digit
+    """
+    code = 0
+    for value in reversed(result):
+        code = code * 3 + value + 1
 
-                if print_progress:
-                    print(f"{round(fraction_done * 100, 1)}% Done for {letter_num} letters")
+    return code
 
-        return good_letters
 
-    def analise_quick(self, print_progress=True):
-        """
-        Quickly returns a full list of possible words followed by a score. This is supposed to be a faster way of
-        calculating analysis then the self.analise, and will not often collate to the result of the analise function.
-        In order for these scores to be useful the best words of them should have a new score calculated with the
-        analise_word function
+def result_to_string(result):
+    """Turns a result in the format of the WordleGame.guess output into a string of tiles, eg. GGYRR"""
+    return "".join([{1: "G", 0: "Y", -1: "R"}[value] for value in result])
 
-        This functions scores words based on what letters they contain, where letter combinations the letters are often
-        in the possible wordles are scored lower and better.
 
-        Returns a dictionary
-        """
+def string_to_result(text):
+    """Turns a string of tiles, eg. GGYRR, into a result in the format of the WordleGame.guess output"""
+    values = {"G": 1, "Y": 0, "R": -1}
+    if text.upper().strip("GYR"):
+        raise ValueError(f"{text} isn't a result made of G, Y and R, eg. GGYRR")
 
-        # Returns the base case where the guess is the first guess, which will take a long time so is pre-computed
-        if len(self.possible_wordles) == len(self.possible_words) and self.length == 5:
-            return self.best_start_word
+    return [values[i.upper()] for i in text]
 
-        best_letter_combos = []
-        for i in range(self.length):
-            section = self.analise_quick_section(i + 1, print_progress=print_progress)
-            best_letter_combos.extend(section)
 
-            if print_progress:
-                print(f"Finished analysing {i + 1} letter combos")
+def check_guess(guess, result, length):
+    """
+    Raises a ValueError if a guess isn't a word of length letters from A to Z, or its result isn't length tiles in the
+    format of the WordleGame.guess output. Used to check guesses that come from outside, before they are used
+    """
+    if not isinstance(guess, str) or len(guess) != length or not set(guess.upper()) <= set(LETTERS):
+        raise ValueError(f"{guess} isn't a {length} letter word made of the letters A to Z")
 
-        best_letter_combos.sort(key=lambda x: x[1])
+    if not isinstance(result, (list, tuple)) or len(result) != length or not set(result) <= {-1, 0, 1}:
+        raise ValueError(f"{guess} doesn't have a result of {length} tiles")
 
-        words_with_score = {}
 
-        if print_progress:
-            print("Scoring all possible guesses")
+def history_key(history):
+    """Turns a list of guesses and results into a string, eg. LARES:RYRRG,TONIC:RRRRR"""
+    return ",".join([f"{guess}:{result_to_string(result)}" for guess, result in history])
 
-        t = time.time()
-        for word_index, word in enumerate(self.possible_words):
-            for letters, score in best_letter_combos:
-                if all([letter in word for letter in letters]):
-                    words_with_score[word] = score
-                    break
 
-            if print_progress and t + 5 < time.time():
-                t = time.time()
-                print(f"{round(word_index / len(self.possible_words) * 100, 1)}% Done scoring words")
+def history_from_key(key):
+    """Turns a string made by history_key back into a list of guesses and results"""
+    history = []
+    for item in key.split(","):
+        if item.strip():
+            guess, result = item.strip().split(":")
+            history.append((guess.upper(), string_to_result(result)))
 
-        return words_with_score
+    return history
 
-    def get_best_guesses(self, print_progress=True):
-        """
-        Returns the 20 best guesses which narrow it down the most, and the 20 best guesses that are possible wordles.
-        Set print_progress to True to print out the progress of the function.
-        """
 
-        # word_scores is most likely a dictionary of all possible words with a score. lower scores are better
+def decode_pattern(code, length):
+    """Turns a number made by encode_result back into a list of ints in the format of the WordleGame.guess output"""
+    result = []
+    for _ in range(length):
+        code, digit = divmod(code, 3)
+        result.append(digit - 1)
 
-        word_scores = self.analise_v2(print_progress)
-        if not word_scores:
-            word_scores = self.analise_quick(print_progress)
-            used_quick_analise = True
-        else:
-            used_quick_analise = False
+    return result
 
-        # Deals with the starting case where best word would take a very long time to calculate
-        if type(word_scores) is str:
-            return [(word_scores, 289)], [(word_scores, 289)]
 
-        wordle_scores = {key: value for key, value in word_scores.items() if key in self.possible_wordles}
+def pattern_typecode(length):
+    """Returns the smallest array typecode that can hold every pattern code for words of this length, or None"""
+    for typecode in "BHI":
+        if 3 ** length <= 2 ** (array(typecode).itemsize * 8):
+            return typecode
 
-        # calculates the real value for the 100 best word and wordles
-        if used_quick_analise:
-            if print_progress:
-                print("Calculate real scores")
+    return None
 
-            best_words = [word for word in word_scores]
-            best_words.sort(key=lambda x: word_scores[x])
-            best_words = best_words[:100]
 
-            best_wordles = [word for word in wordle_scores]
-            best_wordles.sort(key=lambda x: wordle_scores[x])
-            best_wordles = best_wordles[:100]
+def words_digest(words):
+    """Returns a hash of a word list, used to check that a saved file was made from the same words"""
+    return hashlib.sha256("\n".join(words).encode()).digest()
 
-            word_scores = {}
-            wordle_scores = {}
 
-            # This is a set of the 100 best words and the 100 best wordles that should have a real calculated score
-            words_to_score = set(best_words + best_wordles)
+def weighted_expected_remaining(codes, weights, weight_total):
+    """
+    Returns the average number of wordles left after a guess, where each wordle gets the result codes[i] and is as
+    likely as weights[i]. The weight left is scaled so that giving every wordle the same weight gives the same score
+    as not weighting them
+    """
+    masses = {}
+    for code, weight in zip(codes, weights):
+        masses[code] = masses.get(code, 0.0) + weight
 
-            t = time.time()
-            for index, word in enumerate(words_to_score):
-                word_scores[word] = self.analise_word_v2(word)
-                if word in self.possible_wordles:
-                    wordle_scores[word] = word_scores[word]
+    return len(weights) * sum([mass * mass for mass in masses.values()]) / (weight_total * weight_total)
 
-                if print_progress and t + 5 < time.time():
-                    t = time.time()
-                    print(f"{round(index / len(words_to_score) * 100, 1)}% Done calculating real scores")
 
-        output = []
+def index_getter(indices):
+    """Returns a function that takes a sequence and returns a tuple of the items at these indices"""
+    if len(indices) == 1:
+        index = indices[0]
+        return lambda sequence: (sequence[index],)
 
-        for score_dict in (word_scores, wordle_scores):
-            score_list = sorted(list(score_dict.items()), key=lambda x: x[1])[:20]
+    return itemgetter(*indices)
 
-            output.append(score_list)
 
-        return output[0], output[1]
+class FeedbackKernel:
+    """
+    Works out the results of guessing words against a whole block of wordles at once, as pattern codes made by
+    encode_result. Every result the solver uses comes from here: the games, the pattern matrix and the analysis.
 
-    def analise_word(self, word, print_progress=True):
-        """
-        Returns the average number of wordles this word if guesses narrows it down to. Time it takes to execute is
-        proposal to the square of number of possible wordles, and can take up to 120 seconds with 13000 wordles. If
-        print_progresss is set to True, then the function displays how much the of the function is complete
-        """
-        output = []
+    A python int is treated as a long list of fixed width numbers, one for each wordle. For each position and letter
+    there is one of these that is 1 for the wordles with that letter in that position, and for each letter and count
+    there is one that is 1 for the wordles with at least that many of the letter. These are combined with & | and ^,
+    which works on every wordle at once, and the tiles are added up into the pattern codes.
 
-        hints_copy = {key: value[:] for key, value in self.hints.items()}
+    Tiles are coloured the standard way, greens first and then yellows from left to right, so a letter that is guessed
+    more times then it is in the wordle is only coloured as many times as it is in the wordle.
+    """
 
-        t = time.time()
+    def __init__(self, wordles, typecode=None):
+        self.wordles = wordles
+        self.size = len(wordles)
+        self.length = len(wordles[0]) if wordles else 0
+
+        self.typecode = typecode or pattern_typecode(self.length) or "Q"
+        self.nbytes = self.size * array(self.typecode).itemsize
+        self.ones = self.to_lanes([1] * self.size)
+
+        self.in_place = [{letter: self.to_lanes([wordle[letter_index] == letter for wordle in wordles])
+                          for letter in {wordle[letter_index] for wordle in wordles}}
+                         for letter_index in range(self.length)]
+
+        # at_least[letter][n] is 1 for the wordles with at least n of the letter
+        self.at_least = {}
+        for letter in set("".join(wordles)):
+            counts = [wordle.count(letter) for wordle in wordles]
+            self.at_least[letter] = [self.ones] + [self.to_lanes([count >= n for count in counts])
+                                                   for n in range(1, max(counts) + 1)]
+
+    def to_lanes(self, values):
+        """Packs a list of numbers, one for each wordle, into an int"""
+        return int.from_bytes(array(self.typecode, values).tobytes(), sys.byteorder)
+
+    def with_at_least(self, letter, count):
+        """Returns the lanes that are 1 for the wordles with at least count of a letter"""
+        counts = self.at_least.get(letter, [self.ones])
+        return counts[count] if count < len(counts) else 0
+
+    def packed(self, guess):
+        """Returns the pattern codes of guessing a word against every wordle, packed into an int"""
+        guess = guess.upper()
+        if len(guess) != self.length:
+            raise ValueError(f"{guess} isn't {self.length} letters long")
 
-        for index, wordle in enumerate(self.possible_wordles):
-            self.game.set_wordle(wordle)
+        # Every result is worked out here, so this counts one for each wordle
+        _stats.count("results", self.size)
 
-            self.update_hints(word, self.game.guess(word), hints_copy)
-            output.append(self.possible_wordle_count_v2(hints_copy)[0])
+        places = {}
+        for letter_index, letter in enumerate(guess):
+            places.setdefault(letter, []).append(letter_index)
 
-            hints_copy = {key: value[:] for key, value in self.hints.items()}
+        packed = 0
+        for letter, letter_indices in places.items():
+            greens = [self.in_place[letter_index].get(letter, 0) for letter_index in letter_indices]
 
-            if print_progress and t + 5 < time.time():
-                t = time.time()
-                print(f"{round(index / len(self.possible_wordles) * 100, 1)}% Done analysing {word}")
+            # A letter that is guessed once is yellow for the wordles that contain it where it isn't green
+            if len(letter_indices) == 1:
+                packed += (self.with_at_least(letter, 1) + greens[0]) * 3 ** letter_indices[0]
+                continue
 
-        return sum(output) / len(output)
+            # The nth copy of the letter is yellow if it isn't green and the wordle has at least n of the letter
+            # plus one for each later copy that is green. Going from the last copy to the first, exactly[g] is 1 for
+            # the wordles where g of the later copies are green
+            exactly = [self.ones]
+            for copy in range(len(letter_indices) - 1, -1, -1):
+                green = greens[copy]
+                not_green = self.ones ^ green
 
-    def analise_test(self):
-        """Counts the most common letters in the wordle list"""
-        letter_freq = {}
+                yellow = 0
+                for later_greens, wordles in enumerate(exactly):
+                    yellow |= wordles & self.with_at_least(letter, copy + 1 + later_greens)
 
-        for wordle in self.possible_wordles:
-            for letter in wordle:
+                packed += (2 * green + (yellow & not_green)) * 3 ** letter_indices[copy]
 
-                # Doesn't count letters used multiple times
-                if wordle.index(letter) == 0:
-                    if letter in letter_freq:
-                        letter_freq[letter] += 1
-                    else:
-                        letter_freq[letter] = 1
+                exactly = [(exactly[count] & not_green if count < len(exactly) else 0)
+                           | (exactly[count - 1] & green if count else 0) for count in range(len(exactly) + 1)]
 
-        letter_freq_list = list(letter_freq.items())
-        letter_freq_list.sort(key=lambda x: letter_freq[x[0]], reverse=True)
+        return packed
 
-        print(letter_freq_list)
-        most_common_letters = letter_freq_list[:3] + letter_freq_list[4:6]
-        print(most_common_letters)
-        most_common_letters = [x[0] for x in most_common_letters]
+    def packed_bytes(self, guess):
+        """Returns the pattern codes of guessing a word against every wordle, as the bytes of an array"""
+        return self.packed(guess).to_bytes(self.nbytes, sys.byteorder)
 
-        good_guesses = {wordle: self.analise_word(wordle, print_progress=True) for wordle in self.possible_wordles
-                        if all([letter in wordle for letter in most_common_letters])}
+    def codes(self, guess):
+        """Returns an array of the pattern code of guessing a word against each wordle"""
+        return array(self.typecode, self.packed_bytes(guess))
 
-        print(good_guesses)
+    def block(self, guesses):
+        """Returns the pattern codes of guessing each of the guesses against every wordle, as a list of arrays"""
+        return [self.codes(guess) for guess in guesses]
 
-    def analise_word_v2(self, word, print_progress=True):
-        """Quickly analyses a word, and returns the average number of wordles it will narrow it down to"""
 
-        possible_wordles_copy = self.possible_wordles[:]
+class PatternMatrix:
+    """
+    A precomputed table of the result of guessing every word against every word of the same length. Each result is
+    stored as one number made by encode_result, so which bucket a wordle falls in for a guess is a single lookup.
 
-        guess_results = []
-        # While there are still words to analise...
+    The table is built once for each word length, saved to a file, and opened with mmap so that a new process can use
+    it straight away without building it again. Row n holds the results of guessing the nth word against every word.
+    """
 
-        start_time = t = time.time()
-        while possible_wordles_copy:
-            hints = {key: value[:] for key, value in self.hints.items()}
+    # Changed from WPM1 when repeated letters started being scored correctly, so old tables are built again
+    MAGIC = b"WPM2"
+    # magic, word length, number of words, typecode, byte order, hash of the word list
+    HEADER = struct.Struct("<4sHIcc32s")
+    HEADER_SIZE = 64
 
-            # Picking the first word form our list of possible wordles
-            wordle = possible_wordles_copy[0]
-            self.game.set_wordle(wordle)
-            result = self.game.guess(word)
+    def __init__(self, words, filename=None):
+        self.words = words
+        self.length = len(words[0])
+        self.size = len(words)
+        self.index = {word: index for index, word in enumerate(words)}
 
-            # Updating the hints
-            self.update_hints(word, result, hints)
+        self.typecode = pattern_typecode(self.length)
+        self.filename = filename or data_path(PATTERN_MATRIX_FILE.format(self.length))
+        self.digest = words_digest(words)
 
-            # A list of all the wordles that match the result
-            wordles_that_match_result = self.possible_wordle_count_v2(hints)[1]
+        self._mmap = None
+        self._rows = None
 
-            # Adds the number of wordles that match this guess to the guess_result list
-            guess_results.append(wordles_that_match_result)
+    def nbytes(self):
+        """Returns the size of the table in bytes"""
+        return self.size * self.size * array(self.typecode).itemsize
 
-            # Filters out the possible wordles to check be
-            possible_wordles_copy = [wordle for wordle in possible_wordles_copy
-                                     if wordle not in wordles_that_match_result]
+    def header(self):
+        """Returns the header that the file of this table should start with"""
+        byteorder = b"<" if sys.byteorder == "little" else b">"
+        header = self.HEADER.pack(self.MAGIC, self.length, self.size, self.typecode.encode(), byteorder, self.digest)
+        return header.ljust(self.HEADER_SIZE, b"\0")
 
-            if print_progress and t + 5 < time.time():
-                print(f"{len(possible_wordles_copy) / len(self.possible_wordles)}% Done with {word}")
+    def open(self):
+        """
+        Opens the saved table with mmap. Returns False if there is no file or the file was made from different words,
+        in which case the table needs to be built
+        """
+        try:
+            with open(self.filename, "rb") as file:
+                if file.read(self.HEADER_SIZE) != self.header():
+                    return False
 
-        def prob(possible_remaining_wordles):
-            """Returns the probability of a list of wordles occurring"""
-            #
-            return len(possible_remaining_wordles) / len(self.possible_wordles)
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
 
-        expected_score = [len(remainging_wordles) * prob(remainging_wordles) for remainging_wordles in guess_results]
+        except (FileNotFoundError, ValueError):
+            return False
 
-        return sum(expected_score)
+        if len(self._mmap) != self.HEADER_SIZE + self.nbytes():
+            self._mmap.close()
+            self._mmap = None
+            return False
 
-    def analise_v2(self, print_progress=True):
-        """A faster verstion on the self.analise fucntion"""
+        self._rows = memoryview(self._mmap)[self.HEADER_SIZE:].cast(self.typecode)
+        return True
 
-        if len(self.possible_wordles) == len(self.possible_words):
-            word_scores = read_from_file("StartingWordScores.txt")
+    def build(self, print_progress=True):
+        """
+        Calculates the table and saves it to its file. Each row is worked out all at once by a FeedbackKernel of
+        every word, which already packs the codes in the same layout as the file
+        """
+        kernel = FeedbackKernel(self.words, self.typecode)
+        temp_filename = f"{self.filename}.{os.getpid()}.tmp"
 
-            if str(self.length) in word_scores:
-                return word_scores[str(self.length)]
-            else:
-                return {}
+        t = time.time()
+        try:
+            with open(temp_filename, "wb") as file:
+                file.write(self.header())
 
-        result = {}
-        start_time = t = time.time()
-        for word_index, word in enumerate(self.possible_words):
-            result[word] = self.analise_word_v2(word, print_progress=print_progress)
+                for word_index, word in enumerate(self.words):
+                    file.write(kernel.packed_bytes(word))
 
-            if print_progress and t + 5 < time.time():
-                t = time.time()
+                    if print_progress and t + 5 < time.time():
+                        t = time.time()
+                        fraction_done = word_index / self.size
+                        report_progress(f"{round(fraction_done * 100, 1)}% Done building pattern matrix", fraction_done)
 
-                fraction_done = word_index / len(self.possible_words)
+            os.replace(temp_filename, self.filename)
 
-                if (t - start_time) * 1 / fraction_done > 120:
-                    return {}
+        except OSError:
+            # Don't leave a half written table behind, like when the disk is full
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+            raise
 
-                print(f"{round(fraction_done * 100, 1)}% Done")
+    def row(self, guess_index):
+        """Returns the results of guessing a word against every word, as a sequence of pattern codes"""
+        return self._rows[guess_index * self.size:(guess_index + 1) * self.size]
 
-        return result
+    def lookup(self, guess_index, wordle_index):
+        """Returns the pattern code of guessing a word when the wordle is another word"""
+        return self._rows[guess_index * self.size + wordle_index]
 
+    def indices(self, words):
+        """Returns the index of each word in a list of words"""
+        return [self.index[word] for word in words]
 
-class WordleOptimalPlayer(WordlePlayer):
-    """
-    This class contains methods to directly ask a user what guess they make and display results of analyse of what the
-    best guesses are.
-    """
+    def bucket_sizes(self, guess_index, wordle_indices, getter=None):
+        """Returns a Counter of how many of the wordles give each result when the word is guessed"""
+        if getter is None:
+            getter = index_getter(wordle_indices)
 
-    def __init__(self, length):
-        super().__init__(length)
+        return Counter(getter(self.row(guess_index)))
 
-    def input_guess(self):
+    def expected_remaining(self, guess_index, wordle_indices, getter=None, weights=None):
         """
-        Displays text on the screen to input a guess and the result of the guess
-        It then narrows down the possible wordles
+        Returns the average number of wordles left after guessing a word, if the wordle is one of wordle_indices. If
+        weights is set, then each wordle is as likely as its weight, in the same order as wordle_indices
         """
-        guess = input("\nWhat was the guess? > ").strip("\n").strip(" ")
-        result = input("What was the result of the guess (eg. GGYRR) > ")
+        if weights is not None:
+            if getter is None:
+                getter = index_getter(wordle_indices)
 
-        values = {"G": 1, "Y": 0, "R": -1}
-        self.narrow_possible_wordles(guess, [values[i.upper()] for i in result])
+            return weighted_expected_remaining(getter(self.row(guess_index)), weights, sum(weights))
 
-    def display_possible_wordles(self):
-        """
-        Displays possible wordles. If the number of possible wordles is greater then 10, then is displays the number
-        of possible wordles
-        """
-        number = len(self.possible_wordles)
-        if number > 10:
-            print("Remaining wordles: ", number)
-        else:
-            print("Remaining wordles: ", ", ".join(self.possible_wordles))
+        sizes = self.bucket_sizes(guess_index, wordle_indices, getter).values()
+        return sum([size * size for size in sizes]) / len(wordle_indices)
 
-    def ask_to_analyse(self):
-        """
-        Asks if the player wants to analyse, and if they do, preform the analysis and display the best words and
-        wordles to guess. If it has no information, then it displays one word that is precalculated to be the best.
-        Displays along with the words, the average number of wordles that this word will narrow it down to if the word
-        is guessed
+    def score_all(self, wordle_indices, guess_indices=None, print_progress=True, weights=None):
         """
+        Returns the average number of wordles left after each guess, if the wordle is one of wordle_indices. Scores
+        every word if guess_indices is None. The scores are in the same order as the guesses. If weights is set, then
+        each wordle is as likely as its weight, in the same order as wordle_indices.
 
-        inp = ""
-        while not inp:
-            inp = input("Do analysis to find the best word? ('y' or 'n') > ").lower()
-            if inp and inp[0] != "y":
-                return None
+        The wordles are picked out of each row in one go, and the number of wordles that give each result are counted
+        together, so each guess takes a few calls into C rather then a python loop over the wordles
+        """
+        if guess_indices is None:
+            guess_indices = range(self.size)
 
-        best_guesses = self.get_best_guesses()
+        getter = index_getter(wordle_indices)
+        rows = self._rows
+        size = self.size
+        total = len(wordle_indices)
+        _stats.count("matrix_lookups", len(guess_indices) * total)
 
-        print("\n\n----- Done! -----")
+        scores = []
+        t = time.time()
+        weight_total = None if weights is None else sum(weights)
+        for number, guess_index in enumerate(guess_indices):
+            start = guess_index * size
+            if weights is None:
+                sizes = Counter(getter(rows[start:start + size])).values()
+                scores.append(sum([bucket_size * bucket_size for bucket_size in sizes]) / total)
+            else:
+                scores.append(weighted_expected_remaining(getter(rows[start:start + size]), weights, weight_total))
+
+            if print_progress and t + 5 < time.time():
+                t = time.time()
+                report_progress(f"{round(number / len(guess_indices) * 100, 1)}% Done", number / len(guess_indices))
+
+        return scores
+
+    def score_batch(self, wordle_index_lists, guess_index_lists, print_progress=True, weight_lists=None):
+        """
+        Scores several sets of wordles at once, where guess_index_lists[i] are the guesses to score for the wordles
+        wordle_index_lists[i]. Returns a list of lists of scores, in the same order as the guesses. weight_lists[i] is
+        the weights of the wordles wordle_index_lists[i] like in score_all, or None if they aren't weighted.
+
+        Each row of the matrix is only read once however many sets of wordles it is used by, so scoring a batch of
+        games takes one pass over the matrix rather then one for each game
+        """
+        getters = [index_getter(wordle_indices) for wordle_indices in wordle_index_lists]
+        totals = [len(wordle_indices) for wordle_indices in wordle_index_lists]
+
+        if weight_lists is None:
+            weight_lists = [None] * len(wordle_index_lists)
+        weight_totals = [None if weights is None else sum(weights) for weights in weight_lists]
+
+        # Which of the sets of wordles each guess needs to be scored for
+        wanted = {}
+        for set_index, guess_indices in enumerate(guess_index_lists):
+            for guess_index in guess_indices:
+                wanted.setdefault(guess_index, []).append(set_index)
+
+            _stats.count("matrix_lookups", len(guess_indices) * totals[set_index])
+
+        rows = self._rows
+        size = self.size
+
+        scores = [{} for _ in wordle_index_lists]
+        t = time.time()
+        for number, guess_index in enumerate(sorted(wanted)):
+            start = guess_index * size
+            row = rows[start:start + size]
+
+            for set_index in wanted[guess_index]:
+                weights = weight_lists[set_index]
+                if weights is None:
+                    sizes = Counter(getters[set_index](row)).values()
+                    total = totals[set_index]
+                    scores[set_index][guess_index] = sum([bucket_size * bucket_size for bucket_size in sizes]) / total
+                else:
+                    scores[set_index][guess_index] = weighted_expected_remaining(getters[set_index](row), weights,
+                                                                                 weight_totals[set_index])
+
+            if print_progress and t + 5 < time.time():
+                t = time.time()
+                report_progress(f"{round(number / len(wanted) * 100, 1)}% Done", number / len(wanted))
+
+        return [[set_scores[guess_index] for guess_index in guess_indices]
+                for set_scores, guess_indices in zip(scores, guess_index_lists)]
+
+
+def get_pattern_matrix(length, words, print_progress=True):
+    """
+    Returns the PatternMatrix for a word length, opening its file or building it if it doesn't exist yet. Only one is
+    opened per length in each process. Returns None if there are no words, the table would be too big, or its file
+    can't be written or read, so that the words are scored without a table instead
+    """
+    if length not in _pattern_matrices:
+        patterns = None
+        if words and pattern_typecode(length) is not None:
+            patterns = PatternMatrix(words)
+
+            if patterns.nbytes() > PATTERN_MATRIX_MAX_BYTES:
+                patterns = None
+
+            else:
+                try:
+                    if not patterns.open():
+                        # This can take a while and write a big file, so say so rather then going quiet
+                        if print_progress:
+                            report_progress(f"Building the pattern matrix for {length} letter words, "
+                                            f"{round(patterns.nbytes() / 2 ** 20, 1)} MB saved to {patterns.filename}")
+                        with _stats.timer("pattern_matrix_build"):
+                            patterns.build(print_progress)
+                        if not patterns.open():
+                            patterns = None
+
+                except OSError as error:
+                    if print_progress:
+                        report_progress(f"Couldn't use the pattern matrix for {length} letter words ({error}), "
+                                        f"scoring without it")
+                    patterns = None
+
+        _pattern_matrices[length] = patterns
+
+    return _pattern_matrices[length]
+
+
+# Letter indexes that have been made, by word length
+_letter_indexes = {}
+
+
+class LetterIndex:
+    """
+    Sets of words stored as the bits of a python int, where bit n is set if the nth word is in the set.
+
+    For each position and letter there is a set of the words with that letter in that position, and for each letter
+    and count there is a set of the words with at least that many of the letter. Finding the words that match some
+    hints is then a few & operations, and counting them is a popcount, rather then checking every word.
+
+    The words themselves are also kept as numbers rather then strings: a byte for each letter of each word, from 0
+    for A to 25 for Z, and a 26 bit set of the letters in each word. Strings are only needed to show the words.
+    """
+
+    def __init__(self, words):
+        self.words = words
+        self.size = len(words)
+        self.all = (1 << self.size) - 1
+        self.index = {word: index for index, word in enumerate(words)}
+        self.digest = words_digest(words)
+
+        # The letters of word n are at letters[n * length:(n + 1) * length]
+        length = len(words[0]) if words else 0
+        self.length = length
+        self.letters = "".join(words).encode("ascii").translate(LETTER_NUMBERS)
+
+        # The letters in each position, with the last word first so it ends up as the highest bit
+        columns = [self.letters[letter_index::length][::-1] for letter_index in range(length)]
+        letters = set()
+
+        self.position = []
+        for column in columns:
+            letter_sets = {}
+            for letter_number in set(column):
+                table = bytes([49 if number == letter_number else 48 for number in range(256)])
+                letter_sets[LETTERS[letter_number]] = int(column.translate(table), 2)
+
+            letters.update(letter_sets)
+            self.position.append(letter_sets)
+
+        # at_least[letter][n] is the set of words with at least n of the letter, which is built up one position at a
+        # time, as a word with the letter in this position has one more of it then it did before this position
+        self.at_least = {}
+        for letter in letters:
+            at_least = [self.all] + [0] * length
+            for letter_sets in self.position:
+                word_set = letter_sets.get(letter, 0)
+                for count in range(length, 0, -1):
+                    at_least[count] |= at_least[count - 1] & word_set
+
+            while not at_least[-1]:
+                at_least.pop()
+
+            self.at_least[letter] = at_least
+
+        self.contains = {letter: at_least[1] for letter, at_least in self.at_least.items()}
+
+        # Made by the letter_sets and set_slots properties the first time they're needed
+        self._letter_sets = None
+        self._set_slots = None
+
+    @property
+    def letter_sets(self):
+        """An array of the 26 bit set of the letters in each word, made the first time it's needed"""
+        if self._letter_sets is None:
+            letter_sets = [0] * self.size
+            for letter, word_set in self.contains.items():
+                bit = letter_bit(letter)
+                for index in self.indices_of(word_set):
+                    letter_sets[index] |= bit
+
+            self._letter_sets = array("I", letter_sets)
+
+        return self._letter_sets
+
+    @property
+    def set_slots(self):
+        """
+        A tuple for each word of the sets it's in, made the first time it's needed. The set of words with letter l in
+        position i is slot i * 26 + l, and the set of words with at least n of letter l is slot (length + n - 1) * 26
+        + l, so the sets of every word can be looked up in one list of 2 * length * 26 items
+        """
+        if self._set_slots is None:
+            set_slots = []
+            for start in range(0, len(self.letters), self.length):
+                counts = [0] * 26
+                slots = []
+                for letter_index, letter_number in enumerate(self.letters[start:start + self.length]):
+                    slots.append(letter_index * 26 + letter_number)
+                    slots.append((self.length + counts[letter_number]) * 26 + letter_number)
+                    counts[letter_number] += 1
+
+                set_slots.append(tuple(slots))
+
+            self._set_slots = set_slots
+
+        return self._set_slots
+
+    def mask_of(self, words):
+        """Returns the set of words from a list of words"""
+        bits = bytearray(b"0" * self.size)
+        for word in words:
+            bits[self.size - 1 - self.index[word]] = ord("1")
+
+        return int(bits, 2) if bits else 0
+
+    def selectors(self, mask):
+        """Returns a byte for each word, which is 1 if it is in the set and 0 if it isn't, for itertools.compress"""
+        return format(mask, f"0{self.size}b")[::-1].encode().translate(bytes.maketrans(b"01", b"\0\1"))
+
+    def words_of(self, mask):
+        """Returns a list of the words in a set"""
+        return list(itertools.compress(self.words, self.selectors(mask)))
+
+    def indices_of(self, mask):
+        """Returns a list of the index of each word in a set"""
+        return list(itertools.compress(range(self.size), self.selectors(mask)))
+
+    def letter_sets_of(self, mask):
+        """Returns a list of the 26 bit set of the letters of each word in a set"""
+        return list(itertools.compress(self.letter_sets, self.selectors(mask)))
+
+    def in_position(self, letter, letter_index):
+        """Returns the set of words with a letter in a position"""
+        return self.position[letter_index].get(letter, 0)
+
+    def containing(self, letter):
+        """Returns the set of words that contain a letter"""
+        return self.contains.get(letter, 0)
+
+    def with_at_least(self, letter, count):
+        """Returns the set of words with at least count of a letter"""
+        at_least = self.at_least.get(letter, [self.all])
+        return at_least[count] if count < len(at_least) else 0
+
+    def match(self, hints, mask=None):
+        """Returns the set of words from mask (all words if None) that match the hints, which are a Constraints"""
+        _stats.count("filters")
+
+        if mask is None:
+            mask = self.all
+
+        for letter_index, allowed in enumerate(hints.allowed):
+            if allowed == ALL_LETTERS:
+                continue
+
+            # No letter can go here, so no word can match
+            if not allowed:
+                return 0
+
+            # When the letter is known, it's faster to keep the words with it then remove the words without
+            if allowed & (allowed - 1) == 0:
+                mask &= self.in_position(letter_from_bit(allowed), letter_index)
+                continue
+
+            for letter, word_set in self.position[letter_index].items():
+                if not allowed & letter_bit(letter):
+                    mask &= ~word_set
+
+        for letter_number, count in enumerate(hints.min_counts):
+            if count:
+                mask &= self.with_at_least(LETTERS[letter_number], count)
+
+        # Letters that can't be in the wordle at all are already taken out of every position
+        for letter_number, count in enumerate(hints.max_counts):
+            if 0 < count < hints.length:
+                mask &= ~self.with_at_least(LETTERS[letter_number], count + 1)
+
+        return mask
+
+    def matches(self, index, hints):
+        """
+        Returns True if the word with this index matches the hints, which are a Constraints. Checks the letters of the
+        one word, so is quicker then match for a single word
+        """
+        _stats.count("word_matches")
+        letters = self.letters[index * self.length:(index + 1) * self.length]
+
+        for allowed, letter_number in zip(hints.allowed, letters):
+            if not allowed >> letter_number & 1:
+                return False
+
+        for letter_number, (least, most) in enumerate(zip(hints.min_counts, hints.max_counts)):
+            if least or most < self.length:
+                if not least <= letters.count(letter_number) <= most:
+                    return False
+
+        return True
+
+
+def get_letter_index(length, words):
+    """Returns the LetterIndex for a word length, making it the first time. Only one is made per length"""
+    if length not in _letter_indexes:
+        _letter_indexes[length] = LetterIndex(words)
+
+    return _letter_indexes[length]
+
+
+LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+ALL_LETTERS = 2 ** len(LETTERS) - 1
+
+# Turns the bytes of an upper case word into the number of each letter, from 0 for A to 25 for Z
+LETTER_NUMBERS = bytes.maketrans(LETTERS.encode("ascii"), bytes(range(len(LETTERS))))
+
+
+def letter_bit(letter):
+    """Returns the bit of a letter in a 26 bit set of letters, where A is the lowest bit"""
+    return 1 << (ord(letter) - 65)
+
+
+def letter_from_bit(bit):
+    """Returns the letter of a set of letters with one letter in it"""
+    return LETTERS[bit.bit_length() - 1]
+
+
+class Constraints:
+    """
+    Everything known about the wordle from the results of the guesses so far. For each position there is a 26 bit set
+    of the letters that could be there, and for each letter there is the least and most number of times it can be in
+    the wordle.
+
+    These can't be changed. update returns a new Constraints with the result of a guess added, so the constraints
+    can be shared and tried out with different guesses without being copied. compile turns them into a regular
+    expression that is used to check if a word matches.
+    """
+
+    __slots__ = ("length", "allowed", "min_counts", "max_counts", "_matcher")
+
+    def __init__(self, length, allowed=None, min_counts=None, max_counts=None):
+        object.__setattr__(self, "length", length)
+        object.__setattr__(self, "allowed", allowed or (ALL_LETTERS,) * length)
+        object.__setattr__(self, "min_counts", min_counts or (0,) * len(LETTERS))
+        object.__setattr__(self, "max_counts", max_counts or (length,) * len(LETTERS))
+        object.__setattr__(self, "_matcher", None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Constraints can't be changed, use update to make new ones")
+
+    def __reduce__(self):
+        return Constraints, (self.length, self.allowed, self.min_counts, self.max_counts)
+
+    def __eq__(self, other):
+        return isinstance(other, Constraints) and self.__reduce__() == other.__reduce__()
+
+    def __hash__(self):
+        return hash(self.__reduce__()[1])
+
+    def __repr__(self):
+        return f"Constraints({self.length}, {self.pattern()!r})"
+
+    def update(self, guess, result):
+        """
+        Returns new constraints with the information from the result of a guess added. result is in the format of the
+        WordleGame.guess output.
+
+        The wordle has at least as many of a letter as there are green and yellow tiles of it. If one of the tiles of
+        a letter is grey, then the wordle has exactly that many, as every copy of it in the wordle would have been
+        coloured first. A letter that isn't green isn't in that position either way
+        """
+        guess = guess.upper()
+        _stats.count("hint_updates")
+
+        allowed = list(self.allowed)
+        min_counts = list(self.min_counts)
+        max_counts = list(self.max_counts)
+
+        for letter_index, (letter, value) in enumerate(zip(guess, result)):
+            if value == 1:
+                allowed[letter_index] = letter_bit(letter)
+            else:
+                allowed[letter_index] &= ~letter_bit(letter)
+
+        for letter in set(guess):
+            letter_number = ord(letter) - 65
+            values = [value for guess_letter, value in zip(guess, result) if guess_letter == letter]
+            coloured = len(values) - values.count(-1)
+
+            min_counts[letter_number] = max(min_counts[letter_number], coloured)
+            if -1 in values:
+                max_counts[letter_number] = min(max_counts[letter_number], coloured)
+
+            if not max_counts[letter_number]:
+                allowed = [letters & ~letter_bit(letter) for letters in allowed]
+
+        return Constraints(self.length, tuple(allowed), tuple(min_counts), tuple(max_counts))
+
+    def green_letters(self):
+        """Returns the set of letters that are known to be in a position"""
+        return {letter_from_bit(letters) for letters in self.allowed if letters and letters & (letters - 1) == 0}
+
+    def pattern(self):
+        """Returns a regular expression that matches the words that match the constraints"""
+        parts = []
+        for letter_number, letter in enumerate(LETTERS):
+            if self.min_counts[letter_number]:
+                parts.append(f"(?=(?:.*{letter}){{{self.min_counts[letter_number]}}})")
+
+            if 0 < self.max_counts[letter_number] < self.length:
+                parts.append(f"(?!(?:.*{letter}){{{self.max_counts[letter_number] + 1}}})")
+
+        for letters in self.allowed:
+            if letters == ALL_LETTERS:
+                parts.append(".")
+            elif letters:
+                parts.append("[" + "".join([letter for letter in LETTERS if letters & letter_bit(letter)]) + "]")
+            else:
+                parts.append("(?!)")
+
+        return "".join(parts) + r"\Z"
+
+    def compile(self):
+        """Returns a function that takes a word and returns if it matches, which is made the first time it's needed"""
+        if self._matcher is None:
+            import re
+            object.__setattr__(self, "_matcher", re.compile(self.pattern()).match)
+
+        return self._matcher
+
+    def matches(self, word):
+        """Returns True if the word matches the constraints"""
+        _stats.count("word_matches")
+        return self.compile()(word) is not None
+
+
+# The AnalysisCache shared by every player, made by get_analysis_cache
+_analysis_cache = None
+
+
+class AnalysisCache:
+    """
+    Remembers the output of get_best_guesses for each set of possible wordles, so that it doesn't have to be analysed
+    again when the same set comes up in another game. When the cache gets bigger then max_bytes, the results that
+    were used least recently are forgotten.
+
+    If a filename is given, then the cache is loaded from that file, and save writes it back so it can be used again
+    by the next run.
+    """
+
+    # Part of every key, and changed when the analysis gives other best guesses, like when repeated letters started
+    # being scored correctly, so results saved by an older version aren't used
+    VERSION = 2
+
+    def __init__(self, max_bytes=64 * 2 ** 20, filename=None):
+        self.max_bytes = max_bytes
+        self.filename = filename
+
+        self.entries = OrderedDict()
+        self.sizes = {}
+        self.nbytes = 0
+
+        self.hits = 0
+        self.misses = 0
+
+        if filename is not None and os.path.exists(filename):
+            self.load(filename)
+
+    @staticmethod
+    def entry_size(key, best_guesses):
+        """Roughly how many bytes of memory an entry uses"""
+        size = sys.getsizeof(key) + sys.getsizeof(best_guesses)
+        for scores in best_guesses:
+            size += sys.getsizeof(scores)
+            for word, score in scores:
+                size += sys.getsizeof((word, score)) + sys.getsizeof(word) + sys.getsizeof(score)
+
+        return size
+
+    def __contains__(self, key):
+        if key in self.entries:
+            return True
+
+        self.misses += 1
+        _stats.count("cache_misses")
+        return False
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """Returns the best guesses for a key, and marks them as just used"""
+        self.hits += 1
+        _stats.count("cache_hits")
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key, best_guesses):
+        """Adds the best guesses for a key, forgetting the least recently used ones if the cache is too big"""
+        if key in self.entries:
+            self.nbytes -= self.sizes[key]
+
+        self.entries[key] = best_guesses
+        self.entries.move_to_end(key)
+        self.sizes[key] = self.entry_size(key, best_guesses)
+        self.nbytes += self.sizes[key]
+
+        while self.nbytes > self.max_bytes and self.entries:
+            old_key, _ = self.entries.popitem(last=False)
+            self.nbytes -= self.sizes.pop(old_key)
+
+    def stats(self):
+        """Returns how many entries the cache has, how big it is, and how many lookups were hits and misses"""
+        return {"entries": len(self.entries), "bytes": self.nbytes, "hits": self.hits, "misses": self.misses}
+
+    def save(self, filename=None):
+        """Saves the entries to a file as json, from least to most recently used"""
+        write_to_file(filename or self.filename, list(self.entries.items()))
+
+    def load(self, filename):
+        """Adds the entries from a file made by save"""
+        for key, best_guesses in read_from_file(filename):
+            self.put(key, tuple([[tuple(score) for score in scores] for scores in best_guesses]))
+
+
+def get_analysis_cache():
+    """Returns the AnalysisCache shared by every player"""
+    global _analysis_cache
+    if _analysis_cache is None:
+        _analysis_cache = AnalysisCache()
+
+    return _analysis_cache
+
+
+# Process pools that have been started, by word length and number of workers
+_process_pools = {}
+
+# The player used by a worker process of a process pool, made by _init_worker
+_worker_player = None
+
+
+def _init_worker(length):
+    """Makes the player that a worker process uses to score guesses"""
+    global _worker_player
+    _worker_player = WordlePlayer(length)
+
+
+def _score_chunk(method, hints, wordles_mask, weights, words):
+    """
+    Scores a chunk of guesses in a worker process, given the hints, possible wordles and wordle weights of the player
+    that sent it
+    """
+    player = _worker_player
+    player.hints = hints
+    player.weights = weights
+    player.wordles_mask = wordles_mask
+
+    return player.score_guesses(words, method)
+
+
+def get_process_pool(length, workers):
+    """Returns a pool of worker processes for scoring guesses of a word length, starting it the first time"""
+    import concurrent.futures
+
+    if (length, workers) not in _process_pools:
+        _process_pools[(length, workers)] = concurrent.futures.ProcessPoolExecutor(
+            workers, initializer=_init_worker, initargs=(length,))
+
+    return _process_pools[(length, workers)]
+
+
+class WordlePlayer:
+    """
+    Contain the methods to calculate the best guess given some information
+    This serves as the back end of the system
+
+    If workers is more then 1, then analysis of every guess is split into chunks that are scored by that many
+    processes at the same time
+    """
+
+    # With fewer possible wordles then this, scoring every guess with the PatternMatrix is quicker then grouping them
+    MIN_CLASS_WORDLES = 64
+
+    def __init__(self, length, workers=1, hard_mode=False, answers=None):
+        self.length = length
+        self.workers = workers
+
+        # In hard mode every guess has to match all the hints so far, see guess_pool
+        self.hard_mode = hard_mode
+
+        # The best first guess, from the artifact manifest, which is used instead of analysing when nothing is known
+        self.best_start_word = get_best_start_word(self.length)
+
+        # Shared with every other player of this length, so it must not be modified
+        self.possible_words = get_lexicon().words(self.length)
+
+        # The possible wordles as a set of the letter index, kept up to date by narrow_possible_wordles. The list of
+        # them, possible_wordles, is only made from it when it's needed
+        self.letter_index = get_letter_index(self.length, self.possible_words)
+        self.wordles_mask = self.letter_index.all
+        self._wordles = None
+
+        # The words that can be the wordle can be fewer then the words that can be guessed, and can be more or less
+        # likely then each other. answers is a list of them, or a dictionary of them to how likely they are, and is
+        # read from the answers file if it isn't given. weights is None when they are all as likely
+        if answers is None:
+            answers = get_lexicon().answers(self.length)
+
+        self.weights = None
+        self.answers_digest = ""
+        if answers is not None:
+            if not isinstance(answers, dict):
+                answers = dict.fromkeys(answers, 1.0)
+
+            answers = {word.upper(): float(weight) for word, weight in answers.items()
+                       if word.upper() in self.letter_index.index}
+
+            self.wordles_mask = self.letter_index.mask_of(answers)
+
+            if len(set(answers.values())) > 1:
+                self.weights = answers
+
+            answer_list = [f"{word} {answers[word]!r}" for word in self.possible_wordles]
+            self.answers_digest = hashlib.sha256("\n".join(answer_list).encode()).hexdigest()
+
+        self.game = WordleGame()
+
+        # The FeedbackKernel of the possible wordles and the set of them it was made for, made by feedback_kernel
+        self._kernel = None
+
+        # The hints the hard mode guess pool was made for, and its set and list of words, made by guess_pool_mask
+        self._guess_pool = None
+
+        # The letters that it could be in each position
+        self.hints = Constraints(self.length)
+
+        # Every guess so far and its result, in the order they were made
+        self.history = []
+
+        # How much of the last analysis with a time budget was done, set by get_best_guesses
+        self.coverage = None
+
+        # If the best guesses should be looked up in the opening book when the game is still in it
+        self.use_opening_book = True
+
+        # Where the best guesses are remembered for each set of possible wordles. None to always analyse
+        self.analysis_cache = get_analysis_cache()
+
+    @property
+    def possible_wordles(self):
+        """
+        The list of words that could still be the wordle, made from wordles_mask the first time it's needed after it
+        changes. Every word is the shared list of possible words, so it must not be modified
+        """
+        if self.wordles_mask == self.letter_index.all:
+            return self.possible_words
+
+        if self._wordles is None or self._wordles[0] != self.wordles_mask:
+            self._wordles = (self.wordles_mask, self.letter_index.words_of(self.wordles_mask))
+
+        return self._wordles[1]
+
+    def all_words_possible(self):
+        """
+        Returns True if every word could still be the wordle, and they are all as likely, which is when nothing is
+        known yet and there is no separate list of answers. The first guess is precalculated for this case
+        """
+        return self.weights is None and self.wordles_mask == self.letter_index.all
+
+    def wordle_indices(self):
+        """
+        Returns the index of each possible wordle in the list of possible words, in the same order as possible_wordles.
+        The PatternMatrix is made from the same list, so these are also the indices of the wordles in the matrix
+        """
+        return self.letter_index.indices_of(self.wordles_mask)
+
+    def wordle_weights(self):
+        """Returns how likely each possible wordle is, in the same order, or None if they are all as likely"""
+        if self.weights is None:
+            return None
+
+        return [self.weights[wordle] for wordle in self.possible_wordles]
+
+    def guess_pool(self):
+        """
+        Returns the words that can be guessed. In hard mode only words that match every hint so far can be guessed,
+        so the pool gets smaller as the game goes on. These are every word that matches the hints, which can be more
+        then the possible wordles when there's a list of answers
+        """
+        if not self.hard_mode:
+            return self.possible_words
+
+        self.guess_pool_mask()
+        if self._guess_pool[2] is None:
+            self._guess_pool = self._guess_pool[:2] + (self.letter_index.words_of(self._guess_pool[1]),)
+
+        return self._guess_pool[2]
+
+    def guess_pool_mask(self):
+        """Returns the words that can be guessed, from guess_pool, as a set of the letter index"""
+        if not self.hard_mode:
+            return self.letter_index.all
+
+        # Only made again when the hints change
+        if self._guess_pool is None or self._guess_pool[0] != self.hints:
+            self._guess_pool = self.hints, self.letter_index.match(self.hints), None
+
+        return self._guess_pool[1]
+
+    def update_hints(self, guess, result, hints=None):
+        """
+        Returns the hints with the information gained from the result of a guess added. If hints is None, then it
+        updates self.hints. The hints are a Constraints, which can't be changed, so no copy of them is needed to try
+        out a guess
+        """
+        if hints is None:
+            self.hints = self.hints.update(guess, result)
+            return self.hints
+
+        return hints.update(guess, result)
+
+    def is_match(self, wordle, hints=None):
+        """Returns True if the wordle guess matches the hints. If hints is set to None, then the self.hints is used"""
+        if hints is None:
+            hints = self.hints
+
+        # Words from the word list are checked by their letter numbers, rather then as a string
+        if wordle in self.letter_index.index:
+            return self.letter_index.matches(self.letter_index.index[wordle], hints)
+
+        return hints.matches(wordle)
+
+    def possible_wordle_count(self, hints=None):
+        """Returns the number of wordles from the possible wordle list that match the hints"""
+
+        if hints is None:
+            hints = self.hints
+
+        count = 0
+        matching_wordles = []
+
+        for wordle in self.possible_wordles:
+            if self.is_match(wordle, hints):
+                count += 1
+                matching_wordles.append(wordle)
+
+        return count, matching_wordles
+
+    def possible_wordle_mask(self, hints=None):
+        """Returns the set of possible wordles that match the hints, as a set of the letter index"""
+        if hints is None:
+            hints = self.hints
+
+        return self.letter_index.match(hints, self.wordles_mask)
+
+    def possible_wordle_count_v2(self, hints=None):
+        """A faster version of the possible_wordle_count function, that uses the letter index"""
+        mask = self.possible_wordle_mask(hints)
+        return mask.bit_count(), self.letter_index.words_of(mask)
+
+    def get_rand_word(self):
+        """Returns a random word that could be the wordle, where more likely wordles are picked more often"""
+        return random.choices(self.possible_wordles, self.wordle_weights())[0]
+
+    def feedback_kernel(self):
+        """
+        Returns a FeedbackKernel of the possible wordles, which is made again when they change. Used to score guesses
+        when there is no PatternMatrix
+        """
+        if self._kernel is None or self._kernel[0] != self.wordles_mask:
+            self._kernel = (self.wordles_mask, FeedbackKernel(self.possible_wordles))
+
+        return self._kernel[1]
+
+    def get_patterns(self, print_progress=True):
+        """
+        Returns the PatternMatrix for the possible words, building it the first time it is needed. Returns None if
+        there isn't one for this length, in which case guesses have to be analysed with the hints
+        """
+        return get_pattern_matrix(self.length, self.possible_words, print_progress)
+
+    def score_guesses(self, words, method="analise_word_v2"):
+        """
+        Returns a list of the scores of each word, using the given analise_word method. Used to score the chunks of
+        words that are sent to each worker process
+        """
+        patterns = self.get_patterns(False)
+        if patterns is not None and all([word in patterns.index for word in words]):
+            # Both analise_word methods give the same score when the results can be looked up
+            return patterns.score_all(self.wordle_indices(), patterns.indices(words), False, self.wordle_weights())
+
+        scorer = getattr(self, method)
+        return [scorer(word, False) for word in words]
+
+    def score_chunks_in_parallel(self, words, method="analise_word_v2", chunk_size=None):
+        """
+        Splits the words into chunks and scores them with the worker processes. Yields each chunk with its scores
+        as soon as it is done, which might not be in order. Chunks that haven't started are cancelled if the caller
+        stops early
+        """
+        import concurrent.futures
+
+        if chunk_size is None:
+            chunk_size = max(1, math.ceil(len(words) / (self.workers * 4)))
+
+        # Makes sure the pattern matrix is built here once, rather then by every worker at the same time
+        self.get_patterns(False)
+
+        pool = get_process_pool(self.length, self.workers)
+        futures = {}
+        for i in range(0, len(words), chunk_size):
+            chunk = words[i:i + chunk_size]
+            futures[pool.submit(_score_chunk, method, self.hints, self.wordles_mask, self.weights, chunk)] = chunk
+
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                yield futures[future], future.result()
+
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def analise_parallel(self, words, method="analise_word_v2", print_progress=True, time_limit=None):
+        """
+        Scores the words with the worker processes, and returns a dictionary of the scores in the same order as words.
+        If print_progress is set, then it prints the progress every 5 seconds, and returns an empty dictionary if the
+        whole thing is going to take longer then time_limit seconds
+        """
+        scores = {}
+        start_time = t = time.time()
+        for chunk, chunk_scores in self.score_chunks_in_parallel(words, method):
+            scores.update(zip(chunk, chunk_scores))
+
+            if print_progress and t + 5 < time.time():
+                t = time.time()
+
+                fraction_done = len(scores) / len(words)
+
+                if time_limit is not None and (t - start_time) * 1 / fraction_done > time_limit:
+                    return {}
+
+                report_progress(f"{round(fraction_done * 100, 1)}% Done", fraction_done)
+
+        return {word: scores[word] for word in words}
+
+    def analise(self, print_progress=True):
+        """
+        Analyses all possible guesses and calculates the average number of wordles each guess narrows it down to.
+        The time it takes to execute this function is proportional to len(self.possible_words) *
+        len(self.possible_wordles) ** 2. This is about 2 * 10 ** 12 for 5 letters with no information.
+
+        As this function takes too long to execute with a reasonably large pool of possible wordles, if the function
+        will take three minutes or more to execute, then it returns an empty dictionary
+
+        If print_progress is set then the function prints the % of how much it's done every 5 seconds
+
+        Returns a dictionary
+        """
+
+        # Returns the base case when no information is known
+        if self.all_words_possible() and self.best_start_word is not None:
+            return self.best_start_word
+
+        guess_pool = list(self.guess_pool())
+
+        if self.workers > 1:
+            return self.analise_parallel(guess_pool, "analise_word", print_progress, time_limit=180)
+
+        # Shuffled as a copy, as possible_wordles can be the shared list of words
+        wordles = random.sample(self.possible_wordles, len(self.possible_wordles))
+
+        guesses = {word: [] for word in guess_pool}
+
+        t = start_time = time.time()
+        for wordle_index, wordle in enumerate(wordles):
+            self.game.set_wordle(wordle)
+            for i, word in enumerate(guess_pool):
+                result = self.game.guess(word)
+
+                # When the wordles aren't all as likely, the results are kept to be weighted once they are all known
+                if self.weights is not None:
+                    guesses[word].append(encode_result(result))
+                    continue
+
+                hints = self.update_hints(word, result, self.hints)
+
+                guesses[word].append(self.possible_wordle_mask(hints).bit_count())
+
+                if print_progress and t + 5 < time.time():
+                    t = time.time()
+                    fraction_done = (wordle_index + i / len(guess_pool)) / len(self.possible_wordles)
+
+                    if (1 / fraction_done) * (t - start_time) > 180:
+                        return {}
+
+                    report_progress(f"{round(fraction_done * 100, 1)}% Done", fraction_done)
+
+        if self.weights is not None:
+            weights = [self.weights[wordle] for wordle in wordles]
+            weight_total = sum(weights)
+            return {guess: weighted_expected_remaining(codes, weights, weight_total)
+                    for guess, codes in guesses.items()}
+
+        guesses_with_scores = {guess: sum(result) / len(result) for guess, result in guesses.items()}
+
+        return guesses_with_scores
+
+    def narrow_possible_wordles(self, guess, result):
+        """
+        Modifies the known hints to include the results from this guess. result input takes the format of the output
+        of the WordleGame.guess output; in the format of a list of ints where -1 is Grey, 0 is Yellow, and 1 is Green
+        """
+        self.update_hints(guess, result)
+        self.wordles_mask = self.possible_wordle_mask()
+        self.history.append((guess.upper(), list(result)))
+
+    def analise_quick_section(self, letter_num=5, print_progress=True):
+        """
+        Returns a given number of sets of letters, with a score.
+        At the moment it returns top 1000 letter combinations
+
+        The number of letters in the letter combos are specified by the letter_num input.
+
+        There are many more combos of more letters, which are only needed for long words, so if it will take more then
+        60 seconds to score them all then it returns an empty list
+        """
+        good_letters = [((), 100000)]
+        start = t = check_time = time.time()
+        total = math.factorial(26) / math.factorial(26 - letter_num) / math.factorial(letter_num)
+        too_slow = False
+
+        # Returns the base case where the guess is the first guess, which will take a long time so is pre-computed
+        if self.all_words_possible() and self.best_start_word is not None:
+            return self.best_start_word
+
+        green_letters = self.hints.green_letters()
+
+        superset_counts = letter_superset_counts(self.letter_index.letter_sets_of(self.wordles_mask), letter_num)
+        wordle_count = self.wordles_mask.bit_count()
+        weights = [1 / letter_number_comparison(bin(i).count('1')) for i in range(2 ** letter_num)]
+
+        def scored_combos():
+            nonlocal t, check_time, too_slow
+
+            for letters_index, letters in enumerate(itertools.combinations("QWERTYUIOPASDFGHJKLZXCVBNM", letter_num)):
+                grouping = exact_counts(superset_counts, [letter_bit(letter) for letter in letters])
+
+                # Same as expected(grouping)
+                score = sum([x ** 2 / wordle_count * weight for x, weight in zip(grouping, weights)])
+
+                # If any of the letters are green, then this score should be lowered
+                for letter in letters:
+                    if letter in green_letters:
+                        score /= 1.5
+
+                yield letters, score
+
+                if check_time + 1 < time.time():
+                    check_time = time.time()
+                    fraction_done = letters_index / total
+
+                    if (1 / fraction_done) * (check_time - start) > 60:
+                        too_slow = True
+                        return
+
+                if print_progress and t + 5 < time.time():
+                    t = time.time()
+                    fraction_done = letters_index / total
+                    report_progress(f"{round(fraction_done * 100, 1)}% Done for {letter_num} letters", fraction_done)
+
+        # nsmallest keeps the first of equal scores, so ties are kept in the same order as before
+        good_letters = heapq.nsmallest(1000, itertools.chain(good_letters, scored_combos()), key=itemgetter(1))
+
+        return [] if too_slow else good_letters
+
+    def analise_quick(self, print_progress=True):
+        """
+        Quickly returns a full list of possible words followed by a score. This is supposed to be a faster way of
+        calculating analysis then the self.analise, and will not often collate to the result of the analise function.
+        In order for these scores to be useful the best words of them should have a new score calculated with the
+        analise_word function
+
+        This functions scores words based on what letters they contain, where letter combinations the letters are often
+        in the possible wordles are scored lower and better.
+
+        Returns a dictionary
+        """
+
+        # Returns the base case where the guess is the first guess, which will take a long time so is pre-computed
+        if self.all_words_possible() and self.best_start_word is not None:
+            return self.best_start_word
+
+        best_letter_combos = []
+        for i in range(self.length):
+            section = self.analise_quick_section(i + 1, print_progress=print_progress)
+
+            # Combos of more letters would take even longer, so they are left out too
+            if not section:
+                break
+
+            best_letter_combos.extend(section)
+
+            if print_progress:
+                report_progress(f"Finished analysing {i + 1} letter combos")
+
+        best_letter_combos.sort(key=lambda x: x[1])
+
+        words_with_score = {}
+
+        if print_progress:
+            report_progress("Scoring all possible guesses")
+
+        # Each word gets the score of the best letter combo it has all the letters of. Rather then checking every
+        # combo against every word, the combos are looked up by their set of letters, using every subset of the
+        # letters in the word
+        combo_ranks = {}
+        for rank, (letters, score) in enumerate(best_letter_combos):
+            combo_ranks.setdefault(sum([letter_bit(letter) for letter in set(letters)]), (rank, score))
+
+        letter_set_scores = {}
+        pool_mask = self.guess_pool_mask()
+        for word, letter_set in zip(self.letter_index.words_of(pool_mask), self.letter_index.letter_sets_of(pool_mask)):
+            if letter_set not in letter_set_scores:
+                subsets = [0]
+                for i in range(letter_set.bit_length()):
+                    if letter_set >> i & 1:
+                        subsets += [subset | 1 << i for subset in subsets]
+
+                ranks = [combo_ranks[subset] for subset in subsets if subset in combo_ranks]
+                letter_set_scores[letter_set] = min(ranks)[1] if ranks else None
+
+            if letter_set_scores[letter_set] is not None:
+                words_with_score[word] = letter_set_scores[letter_set]
+
+        return words_with_score
+
+    def get_best_guesses(self, print_progress=True, time_budget=None):
+        """
+        Returns the 20 best guesses which narrow it down the most, and the 20 best guesses that are possible wordles.
+        Set print_progress to True to print out the progress of the function.
+
+        If the guesses so far are in the opening book, then the best guesses are read from it instead. Otherwise they
+        are looked up in the analysis cache, and only analysed if they haven't been before.
+
+        If time_budget is set, then the analysis stops after that many seconds and returns the best guesses it has
+        found so far. How much of the analysis was done is put in self.coverage
+        """
+        self.coverage = None
+
+        with _stats.timer("get_best_guesses"):
+            with _stats.timer("get_best_guesses.lookup"):
+                best_guesses = self.known_best_guesses()
+
+            if best_guesses is not None:
+                return best_guesses
+
+            with _stats.timer("get_best_guesses.analysis"):
+                if time_budget is None:
+                    best_guesses = self.find_best_guesses(print_progress)
+                else:
+                    word_scores, self.coverage = self.analise_anytime(time.time() + time_budget, print_progress)
+                    best_guesses = self.best_guesses_from_scores(word_scores)
+
+            # Only finished analysis is remembered, so it can be finished next time
+            if self.coverage is None or self.coverage["complete"]:
+                self.remember_best_guesses(best_guesses)
+
+        return best_guesses
+
+    def get_lookahead_guess(self, depth=2, time_budget=None, best_guesses=None):
+        """
+        Returns the guess with the lowest expected number of guesses to find the wordle, looking depth guesses ahead
+        with a LookaheadSearch, and that expected number of guesses. The best guesses from get_best_guesses are used
+        as the guesses to search, along with the possible wordles. Returns None if there is no PatternMatrix
+        """
+        search = get_lookahead_search(self.length, self.possible_words, hard_mode=self.hard_mode)
+        if search is None:
+            return None
+
+        if best_guesses is None:
+            best_guesses = self.get_best_guesses(print_progress=False)
+
+        # In hard mode these are picked from the guesses the hints allow, and the search keeps them allowed after that
+        guesses = list(dict.fromkeys([word for word, score in best_guesses[0] + best_guesses[1]]))
+
+        return search.best_guess(self.possible_wordles, guesses, depth, time_budget)
+
+    def known_best_guesses(self):
+        """
+        Returns the best guesses from the opening book if the guesses so far are in it, from the starting word scores
+        if nothing is known yet, or from the analysis cache if they have been analysed before. Returns None if they
+        need to be analysed
+        """
+        # The opening book is played without hard mode, so only its first guess can be used in hard mode
+        if self.use_opening_book and not (self.hard_mode and self.history):
+            book = get_opening_book(self.length, self.possible_words)
+            # A book played with other answers, or none, has other best guesses
+            if book is not None and book.answers == self.answers_digest and history_key(self.history) in book.nodes:
+                _stats.count("opening_book_hits")
+                return book.nodes[history_key(self.history)]
+
+        # The first guess is read straight off the starting word scores, which are already sorted
+        if self.all_words_possible():
+            starter_scores = get_starter_scores(self.length)
+            if starter_scores is not None and len(starter_scores) == len(self.possible_words):
+                _stats.count("starter_score_hits")
+                return starter_scores.best_guesses()
+
+        key = self.analysis_key()
+        if self.analysis_cache is not None and key in self.analysis_cache:
+            return self.analysis_cache.get(key)
+
+        return None
+
+    def remember_best_guesses(self, best_guesses):
+        """Puts the best guesses in the analysis cache, so they aren't analysed again"""
+        if self.analysis_cache is not None:
+            self.analysis_cache.put(self.analysis_key(), best_guesses)
+
+    def best_guesses_from_scores(self, word_scores):
+        """Returns the output of get_best_guesses from a dictionary of the scores of words"""
+        wordle_scores = {word: word_scores[word] for word in self.possible_wordles if word in word_scores}
+        return self.top_guesses(word_scores, wordle_scores)
+
+    def analysis_key(self):
+        """
+        Returns a string that is the same for every player with the same possible wordles and guesses to pick from,
+        which all have the same best guesses. Used to look them up in the analysis cache
+        """
+        mask = self.wordles_mask.to_bytes((self.letter_index.size + 7) // 8, "little")
+
+        # In hard mode the guesses depend on the hints, which a list of answers can hide from the possible wordles
+        if self.hard_mode:
+            mask += self.guess_pool_mask().to_bytes((self.letter_index.size + 7) // 8, "little")
+
+        fingerprint = hashlib.blake2b(self.letter_index.digest + mask, digest_size=16).hexdigest()
+        key = f"v{AnalysisCache.VERSION}:{self.length}:{'hard' if self.hard_mode else 'all'}:{fingerprint}"
+
+        # Players with other answers or weights have other best guesses, even with the same possible wordles
+        if self.answers_digest:
+            key += f":{self.answers_digest[:32]}"
+
+        return key
+
+    def find_best_guesses(self, print_progress=True):
+        """Analyses the possible wordles to find the output of get_best_guesses"""
+
+        # word_scores is most likely a dictionary of all possible words with a score. lower scores are better
+
+        with _stats.timer("analise_v2"):
+            word_scores = self.analise_v2(print_progress)
+
+        if not word_scores:
+            with _stats.timer("analise_quick"):
+                word_scores = self.analise_quick(print_progress)
+            used_quick_analise = True
+        else:
+            used_quick_analise = False
+
+        # Deals with the starting case where best word would take a very long time to calculate
+        if type(word_scores) is str:
+            return [(word_scores, 289)], [(word_scores, 289)]
+
+        possible_wordles = set(self.possible_wordles)
+        wordle_scores = {key: value for key, value in word_scores.items() if key in possible_wordles}
+
+        # calculates the real value for the 100 best word and wordles
+        if used_quick_analise:
+            if print_progress:
+                report_progress("Calculate real scores")
+
+            best_words = [word for word in word_scores]
+            best_words.sort(key=lambda x: word_scores[x])
+            best_words = best_words[:100]
+
+            best_wordles = [word for word in wordle_scores]
+            best_wordles.sort(key=lambda x: wordle_scores[x])
+            best_wordles = best_wordles[:100]
+
+            word_scores = {}
+            wordle_scores = {}
+
+            # This is a set of the 100 best words and the 100 best wordles that should have a real calculated score
+            words_to_score = set(best_words + best_wordles)
+
+            t = time.time()
+            for index, word in enumerate(words_to_score):
+                word_scores[word] = self.analise_word_v2(word)
+                if word in self.possible_wordles:
+                    wordle_scores[word] = word_scores[word]
+
+                if print_progress and t + 5 < time.time():
+                    t = time.time()
+                    fraction_done = index / len(words_to_score)
+                    report_progress(f"{round(fraction_done * 100, 1)}% Done calculating real scores", fraction_done)
+
+        return self.top_guesses(word_scores, wordle_scores)
+
+    @staticmethod
+    def top_guesses(word_scores, wordle_scores):
+        """Returns the 20 best words and the 20 best wordles from dictionaries of scores"""
+        output = []
+
+        for score_dict in (word_scores, wordle_scores):
+            score_list = sorted(list(score_dict.items()), key=lambda x: x[1])[:20]
+
+            output.append(score_list)
+
+        return output[0], output[1]
+
+    def guess_order(self):
+        """
+        Returns every possible word, ordered by a quick guess of how good each one is, so the most promising are
+        analysed first. Letters that about half of the possible wordles contain, and letters in positions that lots
+        of the possible wordles have them in, score higher.
+        """
+        mask = self.wordles_mask
+        total = mask.bit_count()
+
+        # A score for each slot of LetterIndex.set_slots, so a word's score is the sum of the scores of its slots.
+        # Each letter is only counted once, so only the slots of at least 1 of a letter get a letter score
+        slot_scores = [(letter_sets.get(letter, 0) & mask).bit_count()
+                       for letter_sets in self.letter_index.position for letter in LETTERS]
+        for letter in LETTERS:
+            count = (self.letter_index.containing(letter) & mask).bit_count()
+            slot_scores.append(min(count, total - count))
+
+        slot_scores += [0] * (self.length - 1) * len(LETTERS)
+
+        set_slots = self.letter_index.set_slots
+        indices = self.letter_index.indices_of(self.guess_pool_mask())
+        promises = [sum(map(slot_scores.__getitem__, set_slots[index])) for index in indices]
+
+        words = self.letter_index.words
+        return [words[indices[position]] for position in sorted(range(len(indices)), key=promises.__getitem__,
+                                                                  reverse=True)]
+
+    def analise_anytime(self, deadline, print_progress=True, chunk_size=256):
+        """
+        Scores as many guesses as it can before the deadline, which is a time from time.time(), and returns the
+        scores it has so far rather then giving up. The most promising guesses and the most promising possible
+        wordles are scored first, a chunk of each at a time, so the best guesses are most likely found early.
+
+        Returns a dictionary of the scores, and a dictionary of how much was covered: how many guesses and possible
+        wordles were scored out of how many, and if every guess was scored
+        """
+        patterns = self.get_patterns(print_progress)
+
+        if self.all_words_possible():
+            word_scores = self.starting_word_scores()
+        else:
+            word_scores = {}
+
+        if not word_scores:
+            # Only one guess from each group of guesses that split up the possible wordles the same way is scored. The
+            # guesses are grouped in order, so if the deadline comes first it's the least promising that are left out
+            guess_order = self.guess_order()
+            representatives = self.guess_classes(guess_order, deadline)
+            possible_wordles = set(self.possible_wordles)
+            guess_order = [word for word in guess_order[:len(representatives)] if representatives[word] is not None]
+            order = list(dict.fromkeys([representatives[word] for word in guess_order]))
+            wordle_order = list(dict.fromkeys([representatives[word] for word in guess_order
+                                               if word in possible_wordles]))
+
+            if patterns is not None:
+                wordle_indices = self.wordle_indices()
+                getter = index_getter(wordle_indices)
+                weights = self.wordle_weights()
+
+            chunks = itertools.chain.from_iterable(itertools.zip_longest(
+                [order[i:i + chunk_size] for i in range(0, len(order), chunk_size)],
+                [wordle_order[i:i + chunk_size] for i in range(0, len(wordle_order), chunk_size)]))
+
+            scores = {}
+            t = time.time()
+            for chunk in chunks:
+                # At least one guess is always scored, so there is a best guess even if the deadline has gone by
+                if scores and time.time() > deadline:
+                    break
+
+                for word in chunk or []:
+                    if word in scores:
+                        continue
+
+                    if patterns is not None:
+                        scores[word] = patterns.expected_remaining(patterns.index[word], wordle_indices, getter,
+                                                                   weights)
+                    else:
+                        scores[word] = self.analise_word_v2(word, print_progress=False)
+
+                    if time.time() > deadline:
+                        break
+
+                if print_progress and t + 5 < time.time():
+                    t = time.time()
+                    fraction_done = len(scores) / max(1, len(order))
+                    report_progress(f"{round(fraction_done * 100, 1)}% Done", fraction_done)
+
+            word_scores = self.expand_scores(representatives, scores)
+
+        wordles_scored = len([word for word in self.possible_wordles if word in word_scores])
+        coverage = {
+            "scored": len(word_scores),
+            "total": len(self.guess_pool()),
+            "wordles_scored": wordles_scored,
+            "wordles_total": len(self.possible_wordles),
+            "complete": len(word_scores) == len(self.guess_pool())
+        }
+
+        return word_scores, coverage
+
+    def analise_word(self, word, print_progress=True):
+        """
+        Returns the average number of wordles this word if guesses narrows it down to. Time it takes to execute is
+        proposal to the square of number of possible wordles, and can take up to 120 seconds with 13000 wordles. If
+        print_progresss is set to True, then the function displays how much the of the function is complete
+
+        If there is a PatternMatrix for this length, then the results are looked up from it instead
+        """
+        patterns = self.get_patterns(print_progress)
+        if patterns is not None and word.upper() in patterns.index:
+            return patterns.expected_remaining(patterns.index[word.upper()], self.wordle_indices(),
+                                               weights=self.wordle_weights())
+
+        output = []
+
+        t = time.time()
+
+        for index, wordle in enumerate(self.possible_wordles):
+            self.game.set_wordle(wordle)
+            result = self.game.guess(word)
+
+            # When the wordles aren't all as likely, the results are kept to be weighted once they are all known
+            if self.weights is not None:
+                output.append(encode_result(result))
+            else:
+                hints = self.update_hints(word, result, self.hints)
+                output.append(self.possible_wordle_mask(hints).bit_count())
+
+            if print_progress and t + 5 < time.time():
+                t = time.time()
+                fraction_done = index / len(self.possible_wordles)
+                report_progress(f"{round(fraction_done * 100, 1)}% Done analysing {word}", fraction_done)
+
+        if self.weights is not None:
+            weights = self.wordle_weights()
+            return weighted_expected_remaining(output, weights, sum(weights))
+
+        return sum(output) / len(output)
+
+    def analise_test(self):
+        """Counts the most common letters in the wordle list"""
+        letter_freq = {}
+
+        for wordle in self.possible_wordles:
+            for letter in wordle:
+
+                # Doesn't count letters used multiple times
+                if wordle.index(letter) == 0:
+                    if letter in letter_freq:
+                        letter_freq[letter] += 1
+                    else:
+                        letter_freq[letter] = 1
+
+        letter_freq_list = list(letter_freq.items())
+        letter_freq_list.sort(key=lambda x: letter_freq[x[0]], reverse=True)
+
+        print(letter_freq_list)
+        most_common_letters = letter_freq_list[:3] + letter_freq_list[4:6]
+        print(most_common_letters)
+        most_common_letters = [x[0] for x in most_common_letters]
+
+        good_guesses = {wordle: self.analise_word(wordle, print_progress=True) for wordle in self.possible_wordles
+                        if all([letter in wordle for letter in most_common_letters])}
+
+        print(good_guesses)
+
+    def analise_word_v2(self, word, print_progress=True):
+        """Quickly analyses a word, and returns the average number of wordles it will narrow it down to"""
+
+        patterns = self.get_patterns(print_progress)
+        if patterns is not None and word.upper() in patterns.index:
+            return patterns.expected_remaining(patterns.index[word.upper()], self.wordle_indices(),
+                                               weights=self.wordle_weights())
+
+        if not self.possible_wordles:
+            return 0
+
+        # Without a matrix the results against every possible wordle are worked out all at once by a FeedbackKernel
+        codes = self.feedback_kernel().codes(word)
+        if self.weights is None:
+            sizes = Counter(codes).values()
+            return sum([size * size for size in sizes]) / len(self.possible_wordles)
+
+        weights = self.wordle_weights()
+        return weighted_expected_remaining(codes, weights, sum(weights))
+
+    def guess_classes(self, words, deadline=None):
+        """
+        Groups together the guesses that split up the possible wordles in the same way, so only one of each group
+        needs to be analysed. Returns a dictionary from each word to the first word in its group, or None if the word
+        doesn't split up the possible wordles at all, as it then always leaves every possible wordle.
+
+        The tiles of each letter of a guess only depend on which wordles have that letter in the places the guess
+        has it, and which wordles have at least 1, 2, and so on up to the number of times it's guessed, of the letter.
+        So a guess splits up the wordles by which side of each of these sets they are on, and two guesses with the
+        same sets split them up the same way, whatever letters they're made of. A set with every wordle or none of
+        them doesn't split anything, and a set splits the wordles the same way as the set of the wordles not in it.
+
+        Grouping takes time of its own, so if it won't pay for itself every word is its own group. If the deadline, a
+        time from time.time(), goes by then the rest of the words are left out, as there's no time to analyse them
+        """
+        if not self.classes_pay_off(words):
+            return {word: word for word in words}
+
+        wordles = self.wordles_mask
+
+        # Gives each set of wordles a number, with 0 for the sets that don't split up the wordles
+        set_numbers = {0: 0}
+
+        def set_number(word_set):
+            word_set &= wordles
+            return set_numbers.setdefault(min(word_set, wordles ^ word_set), len(set_numbers))
+
+        # The numbers of the sets in the same order as the slots of LetterIndex.set_slots
+        slot_numbers = [set_number(letter_sets.get(letter, 0))
+                        for letter_sets in self.letter_index.position for letter in LETTERS]
+        slot_numbers += [set_number(self.letter_index.with_at_least(letter, count))
+                         for count in range(1, self.length + 1) for letter in LETTERS]
+
+        # When none of the sets split up the wordles, such as when there's only one, no guess can
+        if len(set_numbers) == 1:
+            return dict.fromkeys(words)
+
+        set_slots = self.letter_index.set_slots
+        word_indices = self.letter_index.index
+
+        representatives = {}
+        groups = {}
+        for word_index, word in enumerate(words):
+            if deadline is not None and word_index and not word_index % 256 and time.time() > deadline:
+                break
+
+            key = set(map(slot_numbers.__getitem__, set_slots[word_indices[word]]))
+            key.discard(0)
+            representatives[word] = groups.setdefault(frozenset(key), word) if key else None
+
+        return representatives
+
+    def classes_pay_off(self, words):
+        """
+        Returns if grouping the guesses with guess_classes is likely to take less time then it saves. Scoring a guess
+        with the PatternMatrix takes about as long as grouping it when there are only a few possible wordles, but
+        without the matrix every guess that is left out saves a whole pass over the possible wordles
+        """
+        return (len(words) > 1 and (len(self.possible_wordles) >= self.MIN_CLASS_WORDLES or
+                                    self.get_patterns(print_progress=False) is None))
+
+    def expand_scores(self, representatives, scores):
+        """
+        Gives every word from guess_classes the score of the first word in its group. Words that don't split up the
+        possible wordles always leave all of them. Words whose group hasn't been scored are left out
+        """
+        expanded = {}
+        for word, representative in representatives.items():
+            if representative is None:
+                expanded[word] = float(len(self.possible_wordles))
+            elif representative in scores:
+                expanded[word] = scores[representative]
+
+        return expanded
+
+    def starting_word_scores(self):
+        """Returns the precalculated scores of every word when nothing is known, or an empty dictionary"""
+        starter_scores = get_starter_scores(self.length)
+        return {} if starter_scores is None else dict(starter_scores.scores)
+
+    def analise_v2(self, print_progress=True):
+        """
+        A faster verstion on the self.analise fucntion
+
+        If there is a PatternMatrix for this length then every guess is scored in one pass over the matrix, which
+        always finishes. Otherwise each word is scored with analise_word_v2, giving up if it will take too long. In
+        hard mode only the words that match the hints can be guessed, so it never gives up
+        """
+
+        if self.all_words_possible():
+            return self.starting_word_scores()
+
+        # Only one guess from each group of guesses that split up the possible wordles the same way is analysed
+        representatives = self.guess_classes(self.guess_pool())
+        guesses = list(dict.fromkeys([word for word in representatives.values() if word is not None]))
+
+        if self.workers > 1:
+            scores = self.analise_parallel(guesses, "analise_word_v2", print_progress,
+                                           time_limit=None if self.hard_mode else 120)
+            return self.expand_scores(representatives, scores) if scores else {}
+
+        patterns = self.get_patterns(print_progress)
+        if patterns is not None:
+            scores = patterns.score_all(self.wordle_indices(), patterns.indices(guesses),
+                                        print_progress, self.wordle_weights())
+            return self.expand_scores(representatives, dict(zip(guesses, scores)))
+
+        result = {}
+        start_time = t = time.time()
+        for word_index, word in enumerate(guesses):
+            result[word] = self.analise_word_v2(word, print_progress=print_progress)
+
+            if print_progress and t + 5 < time.time():
+                t = time.time()
+
+                fraction_done = word_index / len(guesses)
+
+                if not self.hard_mode and (t - start_time) * 1 / fraction_done > 120:
+                    return {}
+
+                report_progress(f"{round(fraction_done * 100, 1)}% Done", fraction_done)
+
+        return self.expand_scores(representatives, result)
+
+
+class WordleOptimalPlayer(WordlePlayer):
+    """
+    This class contains methods to directly ask a user what guess they make and display results of analyse of what the
+    best guesses are.
+    """
+
+    def __init__(self, length, workers=1, hard_mode=False):
+        super().__init__(length, workers, hard_mode)
+
+    def input_guess(self):
+        """
+        Displays text on the screen to input a guess and the result of the guess
+        It then narrows down the possible wordles
+        """
+        guess = input("\nWhat was the guess? > ").strip("\n").strip(" ")
+        result = input("What was the result of the guess (eg. GGYRR) > ")
+
+        self.narrow_possible_wordles(guess, string_to_result(result))
+
+    def display_possible_wordles(self):
+        """
+        Displays possible wordles. If the number of possible wordles is greater then 10, then is displays the number
+        of possible wordles
+        """
+        number = len(self.possible_wordles)
+        if number > 10:
+            print("Remaining wordles: ", number)
+        else:
+            print("Remaining wordles: ", ", ".join(self.possible_wordles))
+
+    def ask_to_analyse(self):
+        """
+        Asks if the player wants to analyse, and if they do, preform the analysis and display the best words and
+        wordles to guess. If it has no information, then it displays one word that is precalculated to be the best.
+        Displays along with the words, the average number of wordles that this word will narrow it down to if the word
+        is guessed
+        """
+
+        inp = ""
+        while not inp:
+            inp = input("Do analysis to find the best word? ('y' or 'n') > ").lower()
+            if inp and inp[0] != "y":
+                return None
+
+        best_guesses = self.get_best_guesses()
+
+        print("\n\n----- Done! -----")
 
         print("Best guesses:")
         for word, score in best_guesses[0]:
@@ -610,159 +2285,876 @@ class WordleOptimalPlayer(WordlePlayer):
         while len(self.possible_wordles) > 1:
             self.display_possible_wordles()
             self.ask_to_analyse()
-            self.input_guess()
+            self.input_guess()
+
+        print("Finished!")
+        print("\nWord Found:", self.possible_wordles[0])
+
+    def start_sim_game(self):
+        """
+        Picks a random word, and simulates a game of wordle with you typing in the answers you want until you're done
+        """
+        wordle = self.get_rand_word()
+        simGame = WordleGame()
+        simGame.set_wordle(wordle)
+
+        guess_num = 0
+
+        while True:
+            self.display_possible_wordles()
+            self.ask_to_analyse()
+
+            guess_num += 1
+            guess = input(f"\nGuess {guess_num} > ")
+
+            result = simGame.guess(guess)
+
+            for item in result:
+                print(item, end=" ")
+                time.sleep(1)
+            print()
+
+            if result == [1] * self.length:
+                print(f"Well done! Guessed in {guess_num} guesses")
+                break
+
+            self.narrow_possible_wordles(guess, result)
+
+
+def get_best_guesses_batch(players, print_progress=True):
+    """
+    Returns the output of get_best_guesses for each player, in the same order. Players with the same possible
+    wordles are only analysed once, and the ones that can be scored with a PatternMatrix are all scored together in
+    one pass over it, so many games going at once cost about as much as the number of different states they are in
+    """
+    keys = [player.analysis_key() for player in players]
+    groups = {}
+    for player_index, key in enumerate(keys):
+        groups.setdefault(key, []).append(player_index)
+
+    answers = {}
+    batches = {}
+    for key, player_indices in groups.items():
+        player = players[player_indices[0]]
+
+        best_guesses = player.known_best_guesses()
+        if best_guesses is not None:
+            answers[key] = best_guesses
+            continue
+
+        # Games with nothing known yet and games split up between worker processes are analysed on their own
+        patterns = player.get_patterns(print_progress)
+        if patterns is None or player.workers > 1 or player.all_words_possible():
+            answers[key] = player.get_best_guesses(print_progress)
+        else:
+            batches.setdefault(player.length, []).append(key)
+
+    for length, batch_keys in batches.items():
+        batch_players = [players[groups[key][0]] for key in batch_keys]
+        patterns = batch_players[0].get_patterns(print_progress)
+
+        # Only one guess from each group of guesses that split up the possible wordles the same way is scored
+        representatives = [player.guess_classes(player.guess_pool()) for player in batch_players]
+        guesses = [list(dict.fromkeys([word for word in player_representatives.values() if word is not None]))
+                   for player_representatives in representatives]
+
+        scores = patterns.score_batch([player.wordle_indices() for player in batch_players],
+                                      [patterns.indices(player_guesses) for player_guesses in guesses],
+                                      print_progress, [player.wordle_weights() for player in batch_players])
+
+        for key, player, player_representatives, player_guesses, player_scores in zip(
+                batch_keys, batch_players, representatives, guesses, scores):
+            word_scores = player.expand_scores(player_representatives, dict(zip(player_guesses, player_scores)))
+            answers[key] = player.best_guesses_from_scores(word_scores)
+            player.remember_best_guesses(answers[key])
+
+    return [answers[key] for key in keys]
+
+
+def string_date(diff):
+    """
+    Takes a number in seconds, and returns a string of how many days, hours, minutes, and seconds it is rounds up the
+    number of seconds to the nearest second
+    """
+    if diff > 10 ** 11:
+        return ""
+
+    times = {
+        "day": 86400,
+        "hour": 3600,
+        "minute": 60,
+        "second": 1
+    }
+
+    output_list = []
+    for item in times.keys():
+        number = math.ceil(diff // times[item])
+
+        if number == 1:
+            output_list.append("1 {}".format(item))
+        elif number >= 2:
+            output_list.append("{} {}s".format(number, item))
+
+        diff -= times[item] * number
+
+    if len(output_list) == 0:
+        return ""
+
+    elif len(output_list) == 1:
+        return output_list[0]
+
+    else:
+        output = ""
+        last = output_list[-1]
+        for item in output_list:
+            if item is not last:
+                output += "{}, ".format(item)
+            else:
+                output += "and {}".format(item)
+
+        return output
+
+
+def percentile(sorted_values, fraction):
+    """Returns the value that this fraction of a sorted list of values are less then or equal to, or 0 if it is empty"""
+    if not sorted_values:
+        return 0
+
+    return sorted_values[min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))]
+
+
+def write_to_file(filename, obj):
+    """
+    Writes an object to a text file, as a json object
+    WARNING: REPLACES ALL TEXT IN THE FILE WITH THE TEXT OF THE INPUT
+
+    The text is written to a temporary file first which then replaces the file, so if the program is stopped part
+    way through the file has either the old or the new object, and never half of one
+    """
+    text = json.dumps(obj)
+    write_bytes_to_file(filename, text.encode())
+
+
+def write_bytes_to_file(filename, data):
+    """
+    Replaces a file with some bytes. They are written to a temporary file first which then replaces the file, so the
+    file is never left half written
+    """
+    temp_filename = f"{filename}.{os.getpid()}.tmp"
+    with open(temp_filename, "wb") as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+
+    os.replace(temp_filename, filename)
+
+
+def read_from_file(filename):
+    """Returns the json object from a given textfile, assuming that the file just contains 1 object"""
+    with open(filename, "r") as txt:
+        return json.loads(txt.read())
+
+
+class CheckpointLog:
+    """
+    A file that json objects are only ever added to the end of, one per line. Each line is written to the disk before
+    append returns, so if the program is killed at most the last line is lost, and replay ignores a line that was only
+    partly written.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+
+    def replay(self):
+        """
+        Returns a list of every object in the log. If the last line was only partly written it is cut off the file, so
+        that new lines are added after the last whole one
+        """
+        objects = []
+        end_of_last_line = 0
+
+        try:
+            with open(self.filename, "rb") as file:
+                for line in file:
+                    if not line.endswith(b"\n"):
+                        break
+
+                    try:
+                        objects.append(json.loads(line))
+                    except ValueError:
+                        break
+
+                    end_of_last_line += len(line)
+
+        except FileNotFoundError:
+            return objects
+
+        if os.path.getsize(self.filename) != end_of_last_line:
+            os.truncate(self.filename, end_of_last_line)
+
+        return objects
+
+    def append(self, objects):
+        """Adds a list of objects to the end of the log, and waits for them to be written to the disk"""
+        with open(self.filename, "ab") as file:
+            file.write(b"".join([json.dumps(obj).encode() + b"\n" for obj in objects]))
+            file.flush()
+            os.fsync(file.fileno())
+
+    def remove(self):
+        """Deletes the log, once everything in it has been saved somewhere else"""
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+
+
+def pick_guess(best_guesses, turn, wordle_count):
+    """
+    The stratagy the simulator uses to pick a guess out of the output of get_best_guesses, given how many guesses have
+    been made and how many possible wordles are left
+    """
+    # The best word to guess to narrow it down the most
+    best_word = best_guesses[0][0]
+
+    # Best word to guess to narrow it down the most that is also a wordle
+    best_wordle = best_guesses[1][0]
+
+    if turn in [0, 1, 4]:
+        if wordle_count > 20 and turn != 4:
+            return best_word[0]
+        else:
+            return best_wordle[0]
+    elif turn == 2 and best_word[1] == 1.0 and best_wordle[1] > 1.0:
+        return best_word[0]
+    else:
+        return best_wordle[0]
+
+
+class WordleSim:
+    """
+    An AI to simulate a game of wordle.
+    """
+    def __init__(self, length, search_depth=0, search_time=None, hard_mode=False):
+        self.length = length
+        self.sim_game = WordleGame()
+        self.hard_mode = hard_mode
+        self.sim_player = WordlePlayer(self.length, hard_mode=hard_mode)
+
+        # If search_depth is set, then guesses after the first are picked by looking that many guesses ahead, taking
+        # up to search_time seconds for each guess
+        self.search_depth = search_depth
+        self.search_time = search_time
+
+    def sim(self, print_progress=True, word=None):
+        """
+        Simulates a game of wordle, playing a stratagy. Returns the wordles guesses.
+        Ends with the correct wordle being guesses.
+        """
+        self.sim_player = WordlePlayer(self.length, hard_mode=self.hard_mode)
+
+        if word is None:
+            # Set the random word as the game
+            self.sim_game.set_wordle(self.sim_player.get_rand_word())
+        else:
+            self.sim_game.set_wordle(word)
+
+        guesses = []
+        done = False
+
+        # How long it took to pick each guess, in seconds
+        self.turn_times = []
+
+        while not done:
+            start_time = time.perf_counter()
+            best_guesses = self.sim_player.get_best_guesses(print_progress=print_progress)
+
+            lookahead_guess = None
+            if self.search_depth and guesses:
+                lookahead_guess = self.sim_player.get_lookahead_guess(self.search_depth, self.search_time,
+                                                                      best_guesses)
+
+            if lookahead_guess is None:
+                guess = pick_guess(best_guesses, len(guesses), len(self.sim_player.possible_wordles))
+            else:
+                guess = lookahead_guess[0]
+
+            self.turn_times.append(time.perf_counter() - start_time)
+
+            guesses.append(guess)
+
+            result = self.sim_game.guess(guesses[-1])
+
+            if print_progress:
+                report_progress(f"Guessed {guess}: result was {result}")
+
+            if result == [1] * self.length:
+                done = True
+            else:
+                self.sim_player.narrow_possible_wordles(guesses[-1], result)
+
+        return guesses
+
+    def bench_games(self, words, workers=1):
+        """
+        Plays a game for each word, and yields the word, the guesses, and how long each guess took to pick. If workers
+        is more then 1, then the games are played by that many processes at the same time, and are yielded in the
+        order they finish
+        """
+        if workers <= 1:
+            for word in words:
+                guesses = self.sim(print_progress=False, word=word)
+                yield word, guesses, self.turn_times
+            return
+
+        # Makes sure the pattern matrix is built here once, rather then by every worker at the same time
+        self.sim_player.get_patterns(False)
+
+        import concurrent.futures
+
+        chunk_size = max(1, min(16, math.ceil(len(words) / (workers * 4))))
+        with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+            futures = [pool.submit(_sim_games, self.length, words[i:i + chunk_size], self.search_depth,
+                                   self.search_time, self.hard_mode)
+                       for i in range(0, len(words), chunk_size)]
+
+            for future in concurrent.futures.as_completed(futures):
+                yield from future.result()
+
+    def bench(self, words=None, sample=None, seed=None, workers=1, report_file=None, print_progress=True):
+        """
+        Plays a game for every word in words, or every word that could be the wordle if it is None, to measure how
+        well and how fast the solver plays. If sample is set then only that many of the words, picked at random with
+        the seed, are played. Games are played by workers processes at the same time.
+
+        Returns a report of the average number of guesses, how many games took each number of guesses, the games that
+        took more then 6 guesses, and how long it took to pick each guess. If report_file is set then the report is
+        also saved to that file as json
+        """
+        if words is None:
+            words = self.sim_player.possible_wordles
+
+        if sample is not None:
+            words = random.Random(seed).sample(words, min(sample, len(words)))
+
+        games = {}
+        start_time = t = time.time()
+        for word, guesses, turn_times in self.bench_games(words, workers):
+            games[word] = (guesses, turn_times)
+
+            if print_progress and t + 5 < time.time():
+                t = time.time()
+                report_progress(f"{len(games)} / {len(words)} games played", len(games) / len(words))
+
+        total_time = time.time() - start_time
+
+        guess_counts = [len(games[word][0]) for word in words]
+        turn_times = sorted(itertools.chain.from_iterable([games[word][1] for word in words]))
+
+        report = {
+            "length": self.length,
+            "games": len(words),
+            "mean_guesses": sum(guess_counts) / len(words) if words else 0,
+            "histogram": {str(count): guess_counts.count(count) for count in sorted(set(guess_counts))},
+            "failures": [word for word in words if len(games[word][0]) > 6],
+            "turn_seconds": {
+                "mean": sum(turn_times) / len(turn_times) if turn_times else 0,
+                "p50": percentile(turn_times, 0.5),
+                "p90": percentile(turn_times, 0.9),
+                "p99": percentile(turn_times, 0.99),
+                "max": turn_times[-1] if turn_times else 0
+            },
+            "total_seconds": total_time,
+            "workers": workers,
+            "search_depth": self.search_depth,
+            "hard_mode": self.hard_mode,
+            "guesses": {word: games[word][0] for word in words}
+        }
+
+        if report_file is not None:
+            write_to_file(report_file, report)
+
+        return report
+
+
+def _sim_games(length, words, search_depth=0, search_time=None, hard_mode=False):
+    """Plays a chunk of the games for WordleSim.bench in a worker process"""
+    return list(WordleSim(length, search_depth, search_time, hard_mode).bench_games(words))
+
+
+def read_game_log(lines):
+    """
+    Yields the games from a log of real games, which has one game a line in the format made by history_key, eg.
+    LARES:RYRRG,TONIC:RRRRR. Each game is yielded as its line number and the line. lines can be an open file, which
+    is then read one line at a time. Blank lines and lines starting with # are skipped
+    """
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line_number, line
+
+
+def replay_game(line_number, line, hard_mode=False):
+    """
+    Replays one game from a game log, narrowing down the possible wordles after each guess the same way a player does.
+    Yields a record of each turn: the guess and its score, the solver's best guess and its score, and the gap between
+    them. Scores are the average number of wordles left after the guess, so a gap of 0 means the guess was as good as
+    the best guess. If the game can't be replayed, then a record with the error is yielded and the game is stopped
+    """
+    try:
+        history = history_from_key(line)
+    except ValueError as error:
+        yield {"game": line_number, "error": f"can't read the game: {error}"}
+        return
+
+    if not history:
+        return
+
+    length = len(history[0][0])
+    if not get_lexicon().words(length):
+        yield {"game": line_number, "error": f"there are no {length} letter words"}
+        return
+
+    player = WordlePlayer(length, hard_mode=hard_mode)
+    for turn, (guess, result) in enumerate(history, 1):
+        try:
+            check_guess(guess, result, length)
+        except ValueError as error:
+            yield {"game": line_number, "turn": turn, "error": str(error)}
+            return
+
+        if not player.wordles_mask:
+            yield {"game": line_number, "turn": turn, "error": "no word matches the results so far"}
+            return
+
+        best = player.get_best_guesses(print_progress=False)[0][0][0]
+
+        # The best guess is scored again the same way as the guess, as the first guess isn't always given a score
+        score = player.analise_word_v2(guess, print_progress=False)
+        best_score = player.analise_word_v2(best, print_progress=False)
+
+        yield {
+            "game": line_number,
+            "turn": turn,
+            "wordles": player.wordles_mask.bit_count(),
+            "guess": guess,
+            "score": score,
+            "best": best,
+            "best_score": best_score,
+            "gap": score - best_score
+        }
+
+        player.narrow_possible_wordles(guess, result)
+
+
+def _replay_chunk(games, hard_mode=False):
+    """Replays a chunk of the games for replay_games in a worker process"""
+    return [record for line_number, line in games for record in replay_game(line_number, line, hard_mode)]
+
+
+def replay_games(games, hard_mode=False, workers=1, chunk_size=16):
+    """
+    Replays games from read_game_log, and yields the record of each turn from replay_game, in the same order as the
+    games. The games are only read as they are needed, so a log of any size is replayed with the same memory.
+
+    If workers is more then 1, then chunks of games are replayed by that many processes at the same time. Only two
+    chunks for each worker are read ahead, so the log still isn't read all at once
+    """
+    if workers <= 1:
+        for line_number, line in games:
+            yield from replay_game(line_number, line, hard_mode)
+        return
+
+    import concurrent.futures
+
+    games = iter(games)
+    chunks = iter(lambda: list(itertools.islice(games, chunk_size)), [])
+
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_replay_chunk, chunk, hard_mode))
+
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+
+        while pending:
+            yield from pending.popleft().result()
+
+
+def replay_log(filename, output=None, hard_mode=False, workers=1, shard=None, print_progress=True):
+    """
+    Replays every game in a game log file, and writes the record of each turn to the output file as a json line, or
+    to stdout if output is None. If shard is (index, count), then only the games on every count-th line, starting
+    from line index, are replayed, so a log can be split up between runs.
+
+    Returns a summary of how close the guesses were to the best guesses: the number of games, turns and errors, the
+    average gap, how many turns had the best guess, and the average gap for each turn number
+    """
+    summary = {"games": 0, "turns": 0, "errors": 0, "mean_gap": None, "optimal_turns": 0, "mean_gap_by_turn": {}}
+    total_gap = 0.0
+    turn_gaps = {}
+
+    def counted(games):
+        for line_number, line in games:
+            if shard is None or line_number % shard[1] == shard[0]:
+                summary["games"] += 1
+                yield line_number, line
+
+    with open(filename) as log, open(output, "w") if output else contextlib.nullcontext(sys.stdout) as out:
+        t = time.time()
+        for record in replay_games(counted(read_game_log(log)), hard_mode, workers):
+            out.write(json.dumps(record) + "\n")
+
+            if "error" in record:
+                summary["errors"] += 1
+                continue
+
+            summary["turns"] += 1
+            total_gap += record["gap"]
+            if record["gap"] <= 1e-9:
+                summary["optimal_turns"] += 1
+
+            gaps = turn_gaps.setdefault(record["turn"], [0, 0.0])
+            gaps[0] += 1
+            gaps[1] += record["gap"]
+
+            if print_progress and t + 5 < time.time():
+                t = time.time()
+                report_progress(f"{summary['turns']} turns of {summary['games']} games replayed")
+
+    if summary["turns"]:
+        summary["mean_gap"] = total_gap / summary["turns"]
+    summary["mean_gap_by_turn"] = {turn: gaps[1] / gaps[0] for turn, gaps in sorted(turn_gaps.items())}
+
+    return summary
+
+
+STARTING_WORD_SCORES_FILE = "StartingWordScores.txt"
+
+# Starting word scores that have been loaded, by word length, made by get_starter_scores
+_starter_scores = {}
+
+
+class StarterScores:
+    """
+    The scores of every word as a first guess, for one word length, from the file made by BestStarterFinder. The
+    words are kept sorted by their score, so the best words can be read off the front rather then sorting them all
+    each time. Words with the same score stay in the order they are in the file
+    """
+
+    def __init__(self, length, scores):
+        self.length = length
+        self.scores = scores
+        self.ranked = sorted(scores.items(), key=itemgetter(1))
+
+    def __len__(self):
+        return len(self.ranked)
+
+    def top(self, k=20):
+        """Returns the k best words and their scores"""
+        return self.ranked[:k]
+
+    def top_of(self, words, k=20):
+        """Returns the k best words out of a collection of words, such as the possible wordles, and their scores"""
+        return list(itertools.islice(((word, score) for word, score in self.ranked if word in words), k))
+
+    def best_guesses(self, wordles=None):
+        """
+        Returns the output of get_best_guesses for the first guess, when the possible wordles are wordles, or every
+        word if wordles is None
+        """
+        return self.top(20), self.top(20) if wordles is None else self.top_of(wordles, 20)
+
+
+def get_starter_scores(length):
+    """
+    Returns the StarterScores for a word length, loading the scores file the first time. Returns None if there are
+    no scores for the length
+    """
+    if length not in _starter_scores:
+        filename = data_path(STARTING_WORD_SCORES_FILE)
+        all_scores = read_from_file(filename) if os.path.exists(filename) else {}
+
+        # The file has every length in it, so they are all loaded at once
+        for length_key, scores in all_scores.items():
+            _starter_scores[int(length_key)] = StarterScores(int(length_key), scores) if scores else None
+
+        _starter_scores.setdefault(length, None)
+
+    return _starter_scores[length]
+
+
+OPENING_BOOK_FILE = "OpeningBook{}.json"
+
+# Opening books that have been loaded, by word length. None if there isn't one
+_opening_books = {}
+
+
+class OpeningBook:
+    """
+    The output of get_best_guesses for every game that is still in its first few guesses and has been played with the
+    simulator's stratagy, so these can be looked up rather then analysed each time. The nodes are stored by the
+    history_key of the guesses and results so far, where the first guess is "". answers is the answers_digest of the
+    players it was played with, as other answers have other best guesses
+
+    The book is built by playing the stratagy for every result each guess could get, up to a number of guesses
+    """
+
+    VERSION = 2
+
+    def __init__(self, length, depth, nodes, digest, answers=""):
+        self.length = length
+        self.depth = depth
+        self.nodes = nodes
+        self.digest = digest
+        self.answers = answers
 
-        print("Finished!")
-        print("\nWord Found:", self.possible_wordles[0])
+    @staticmethod
+    def replay(length, history):
+        """Returns a player that has made the guesses in history, that doesn't look anything up in the opening book"""
+        player = WordlePlayer(length)
+        player.use_opening_book = False
 
-    def start_sim_game(self):
+        for guess, result in history:
+            player.narrow_possible_wordles(guess, result)
+
+        return player
+
+    @classmethod
+    def build(cls, length, depth=2, print_progress=True):
         """
-        Picks a random word, and simulates a game of wordle with you typing in the answers you want until you're done
+        Builds the book for a word length, for the first depth guesses. A depth of 1 is just the first guess, 2 is
+        the first guess and the second guess after every result of the first one, and so on
         """
-        wordle = self.get_rand_word()
-        simGame = WordleGame()
-        simGame.set_wordle(wordle)
+        nodes = {}
+        histories = [[]]
+        answers = ""
 
-        guess_num = 0
+        for turn in range(depth):
+            next_histories = []
 
-        while True:
-            self.display_possible_wordles()
-            self.ask_to_analyse()
+            for history_index, history in enumerate(histories):
+                player = cls.replay(length, history)
+                best_guesses = player.get_best_guesses(print_progress=False)
+                nodes[history_key(history)] = best_guesses
+                answers = player.answers_digest
 
-            guess_num += 1
-            guess = input(f"\nGuess {guess_num} > ")
+                if turn + 1 == depth or len(player.possible_wordles) <= 1:
+                    continue
 
-            result = simGame.guess(guess)
+                guess = pick_guess(best_guesses, turn, len(player.possible_wordles))
 
-            for item in result:
-                print(item, end=" ")
-                time.sleep(1)
-            print()
+                results = {tuple(decode_pattern(code, length)) for code in player.feedback_kernel().codes(guess)}
+                results.discard(tuple([1] * length))
+                next_histories.extend([history + [(guess, list(result))] for result in sorted(results)])
 
-            if result == [1] * self.length:
-                print(f"Well done! Guessed in {guess_num} guesses")
-                break
+                if print_progress:
+                    report_progress(f"Guess {turn + 1}: {history_index + 1} / {len(histories)} games analysed")
 
-            self.narrow_possible_wordles(guess, result)
+            histories = next_histories
 
+        return cls(length, depth, nodes, words_digest(get_lexicon().words(length)).hex(), answers)
 
-def string_date(diff):
+    def save(self, filename=None):
+        """Saves the book to its file as json"""
+        write_to_file(filename or data_path(OPENING_BOOK_FILE.format(self.length)), {
+            "version": self.VERSION,
+            "length": self.length,
+            "depth": self.depth,
+            "digest": self.digest,
+            "answers": self.answers,
+            "nodes": self.nodes
+        })
+
+    @classmethod
+    def load(cls, filename):
+        """Loads a book from a file. Returns None if it was saved by a different version"""
+        data = read_from_file(filename)
+        if data.get("version") != cls.VERSION:
+            return None
+
+        nodes = {key: tuple([[tuple(score) for score in scores] for scores in best_guesses])
+                 for key, best_guesses in data["nodes"].items()}
+
+        return cls(data["length"], data["depth"], nodes, data["digest"], data.get("answers", ""))
+
+
+def get_opening_book(length, words):
     """
-    Takes a number in seconds, and returns a string of how many days, hours, minutes, and seconds it is rounds up the
-    number of seconds to the nearest second
+    Returns the opening book for a word length, loading it the first time. Returns None if there isn't one, or if it
+    was made for a different list of words
     """
-    if diff > 10 ** 11:
-        return ""
+    if length not in _opening_books:
+        filename = data_path(OPENING_BOOK_FILE.format(length))
+        book = None
 
-    times = {
-        "day": 86400,
-        "hour": 3600,
-        "minute": 60,
-        "second": 1
-    }
+        if os.path.exists(filename):
+            book = OpeningBook.load(filename)
+            if book is not None and book.digest != words_digest(words).hex():
+                book = None
 
-    output_list = []
-    for item in times.keys():
-        number = math.ceil(diff // times[item])
+        _opening_books[length] = book
 
-        if number == 1:
-            output_list.append("1 {}".format(item))
-        elif number >= 2:
-            output_list.append("{} {}s".format(number, item))
+    return _opening_books[length]
 
-        diff -= times[item] * number
 
-    if len(output_list) == 0:
-        return ""
+# Lookahead searches that have been made, by word length and width, so their tables are kept between games
+_lookahead_searches = {}
 
-    elif len(output_list) == 1:
-        return output_list[0]
 
-    else:
-        output = ""
-        last = output_list[-1]
-        for item in output_list:
-            if item is not last:
-                output += "{}, ".format(item)
-            else:
-                output += "and {}".format(item)
+class LookaheadSearch:
+    """
+    Picks guesses by looking a few guesses ahead, to find the guess with the lowest expected number of guesses until
+    the wordle is found, rather then the guess that narrows it down the most straight away.
 
-        return output
+    At each set of possible wordles only the width most promising guesses are searched, picked from a pool of good
+    guesses and the possible wordles themselves. A set of n wordles takes at least (2n - 1) / n more guesses, as only
+    one of them can be guessed first, which gives a lower bound for each guess. The guesses are searched from the
+    lowest bound up, and a guess is given up on as soon as its bound is no better then the best guess found so far.
 
+    Sets of wordles that have been searched are kept in a table, by the set of wordles, how many guesses ahead it
+    looked and the pool of guesses it picked from, so a set that is reached more then once with the same pool, in
+    this game or a later one, is only searched once.
 
-def write_to_file(filename, obj):
+    In hard mode every guess has to match the results so far, so after each result only the guesses from the pool
+    that would have got the same result, as the wordles left did, are searched
     """
-    Writes an object to a text file, as a json object
-    WARNING: REPLACES ALL TEXT IN THE FILE WITH THE TEXT OF THE INPUT
-    """
-    text = json.dumps(obj)
-    with open(filename, "w") as txt:
-        txt.write(text)
 
+    # The table is emptied when it gets this big
+    MAX_TABLE_SIZE = 1000000
 
-def read_from_file(filename):
-    """Returns the json object from a given textfile, assuming that the file just contains 1 object"""
-    with open(filename, "r") as txt:
-        return json.loads(txt.read())
+    def __init__(self, patterns, width=8, hard_mode=False):
+        self.patterns = patterns
+        self.width = width
+        self.hard_mode = hard_mode
+        self.solved = encode_result([1] * patterns.length)
+        self.table = {}
+        self.deadline = None
+        self.nodes = 0
 
+    def split(self, guess_index, wordle_indices):
+        """
+        Returns the wordles split up by the result of guessing a word, as lists of wordle indices in the same order.
+        The wordle the guess is right for is left out, as there are no more guesses needed if it's the wordle
+        """
+        rows = self.patterns._rows
+        start = guess_index * self.patterns.size
 
-class WordleSim:
-    """
-    An AI to simulate a game of wordle.
-    """
-    def __init__(self, length):
-        self.length = length
-        self.sim_game = WordleGame()
-        self.sim_player = WordlePlayer(self.length)
+        buckets = {}
+        for wordle_index in wordle_indices:
+            code = rows[start + wordle_index]
+            if code != self.solved:
+                buckets.setdefault(code, []).append(wordle_index)
 
-    def sim(self, print_progress=True, word=None):
+        return list(buckets.values())
+
+    def allowed_after(self, guess_index, wordle_index, pool):
         """
-        Simulates a game of wordle, playing a stratagy. Returns the wordles guesses.
-        Ends with the correct wordle being guesses.
+        Returns the guesses from the pool that are still allowed in hard mode after guessing a word, when the wordle
+        is one that gives the same result as wordle_index. These are the ones that would have got that result too
         """
-        self.sim_player = WordlePlayer(self.length)
+        rows = self.patterns._rows
+        start = guess_index * self.patterns.size
+        code = rows[start + wordle_index]
 
-        if word is None:
-            # Set the random word as the game
-            self.sim_game.set_wordle(self.sim_player.get_rand_word())
+        return tuple([index for index in pool if rows[start + index] == code])
+
+    @staticmethod
+    def lower_bound(buckets, total):
+        """Returns the fewest guesses it could take to find the wordle, with this guess first"""
+        return 1 + sum([2 * len(bucket) - 1 for bucket in buckets]) / total
+
+    def expected_guesses(self, wordle_indices, depth, pool):
+        """
+        Returns the lowest expected number of guesses to find the wordle, counting the guess that finds it, and the
+        guess to make first to get it. wordle_indices must be sorted. Looks depth guesses ahead, after which the
+        lower bound is used. The guesses searched are picked from the pool, a sorted tuple, and the wordles
+        """
+        total = len(wordle_indices)
+        if total <= 2:
+            return (2 * total - 1) / total, wordle_indices[0]
+
+        # Other pools can give other guesses, so the pool is part of the key
+        key = (tuple(wordle_indices), depth, pool)
+        if key in self.table:
+            return self.table[key]
+
+        self.nodes += 1
+        _stats.count("lookahead_nodes")
+        out_of_time = self.deadline is not None and time.time() > self.deadline
+
+        splits = []
+        for guess_index in dict.fromkeys(itertools.chain(pool, wordle_indices)):
+            buckets = self.split(guess_index, wordle_indices)
+
+            # Guesses that don't split up the wordles at all are never any help
+            if len(buckets) == 1 and len(buckets[0]) == total:
+                continue
+
+            splits.append((self.lower_bound(buckets, total), guess_index, buckets))
+
+        splits.sort(key=itemgetter(0, 1))
+        splits = splits[:self.width]
+
+        if depth == 0 or out_of_time:
+            best = splits[0][0], splits[0][1]
         else:
-            self.sim_game.set_wordle(word)
+            best = float("inf"), splits[0][1]
+            for bound, guess_index, buckets in splits:
+                # The guesses are in order of their bound, so none of the rest can be any better
+                if bound >= best[0]:
+                    break
 
-        guesses = []
-        done = False
+                value = bound
+                for bucket in sorted(buckets, key=len, reverse=True):
+                    bucket_pool = pool
+                    if self.hard_mode:
+                        bucket_pool = self.allowed_after(guess_index, bucket[0], pool)
 
-        while not done:
-            best_guesses = self.sim_player.get_best_guesses(print_progress=print_progress)
+                    # Swaps the bound for this bucket for how many guesses it actually takes
+                    bucket_value = self.expected_guesses(bucket, depth - 1, bucket_pool)[0]
+                    value += (bucket_value * len(bucket) - (2 * len(bucket) - 1)) / total
 
-            # The best word to guess to narrow it down the most
-            best_word = best_guesses[0][0]
+                    if value >= best[0]:
+                        break
 
-            # Best word to guess to narrow it down the most that is also a wordle
-            best_wordle = best_guesses[1][0]
+                if value < best[0]:
+                    best = value, guess_index
 
-            if len(guesses) in [0, 1, 4]:
-                if len(self.sim_player.possible_wordles) > 20 and len(guesses) != 4:
-                    guess = best_word[0]
-                else:
-                    guess = best_wordle[0]
-            elif len(guesses) == 2 and best_word[1] == 1.0 and best_wordle[1] > 1.0:
-                guess = best_word[0]
-            else:
-                guess = best_wordle[0]
+        # Results from running out of time didn't look as far ahead as they should have, so aren't kept
+        if not out_of_time:
+            if len(self.table) >= self.MAX_TABLE_SIZE:
+                self.table.clear()
 
-            guesses.append(guess)
+            self.table[key] = best
 
-            result = self.sim_game.guess(guesses[-1])
+        return best
 
-            if print_progress:
-                print(f"Guessed {guess}: result was {result}")
+    def best_guess(self, wordles, guesses, depth=2, time_budget=None):
+        """
+        Returns the guess with the lowest expected number of guesses to find the wordle, looking depth guesses ahead,
+        and that number of guesses. The guesses searched are picked from guesses and the wordles. If time_budget is
+        set, then after that many seconds the rest of the search only uses the lower bounds
+        """
+        self.deadline = None if time_budget is None else time.time() + time_budget
 
-            if result == [1] * self.length:
-                done = True
-            else:
-                self.sim_player.narrow_possible_wordles(guesses[-1], result)
+        wordle_indices = sorted(self.patterns.indices(wordles))
+        pool = tuple(sorted(set(self.patterns.indices(guesses))))
 
-        return guesses
+        value, guess_index = self.expected_guesses(wordle_indices, depth, pool)
+        return self.patterns.words[guess_index], value
+
+
+def get_lookahead_search(length, words, width=8, hard_mode=False):
+    """
+    Returns the LookaheadSearch for a word length, or None if there is no PatternMatrix for it. Hard mode has its own
+    search, as it searches different guesses, so the sets of wordles it has searched can't be used for normal games
+    """
+    key = length, width, hard_mode
+    if key not in _lookahead_searches:
+        patterns = get_pattern_matrix(length, words, print_progress=False)
+        _lookahead_searches[key] = None if patterns is None else LookaheadSearch(patterns, width, hard_mode)
+
+    return _lookahead_searches[key]
 
 
 class BestStarterFinder(WordlePlayer):
@@ -770,44 +3162,619 @@ class BestStarterFinder(WordlePlayer):
     Calculates the scores of the opening words.
     The results of this only have to be calculated once.
     Writes the scores into a text files for each possible word.
+
+    Each score is added to a checkpoint log as soon as it is calculated, and the log is read back when starting again,
+    so it can be stopped at any point. Once every word is scored, the scores are saved to the scores file and the
+    log is deleted.
     """
-    def __init__(self, length):
-        super().__init__(length)
+    SCORES_FILE = STARTING_WORD_SCORES_FILE
+    LOG_FILE = "StartingWordScores.log"
+
+    def __init__(self, length, workers=1):
+        super().__init__(length, workers)
+
+    def scored_words(self, words):
+        """
+        Yields lists of words along with their scores as they are calculated. The words are scored one at a time, or
+        in small chunks by the worker processes if there is more then one worker
+        """
+        if self.workers > 1:
+            yield from self.score_chunks_in_parallel(words, "analise_word", chunk_size=16)
+        else:
+            for word in words:
+                yield [word], [self.analise_word(word, False)]
+
+    def load_scores(self, log):
+        """Returns the scores from the scores file, with the scores from the checkpoint log added"""
+        if os.path.exists(data_path(self.SCORES_FILE)):
+            full_scores = read_from_file(data_path(self.SCORES_FILE))
+        else:
+            full_scores = {}
+
+        for length, word, word_score in log.replay():
+            full_scores.setdefault(str(length), {})[word] = word_score
+
+        return full_scores
 
     def start(self):
-        full_scores = read_from_file("StartingWordScores.txt")
-        calculatedScores = full_scores[str(self.length)]
+        log = CheckpointLog(data_path(self.LOG_FILE))
+        full_scores = self.load_scores(log)
+        calculatedScores = full_scores.setdefault(str(self.length), {})
 
         words_to_calculate = [word for word in self.possible_words if word not in calculatedScores]
 
         start_time = time.time()
-        for word_index, word in enumerate(words_to_calculate):
-            print(f"{word}: ", end="")
-            word_score = self.analise_word(word, False)
-            print(word_score)
-
-            calculatedScores[word] = word_score
+        words_scored = 0
+        for words, word_scores in self.scored_words(words_to_calculate):
+            for word, word_score in zip(words, word_scores):
+                report_progress(f"{word}: {word_score}")
+                calculatedScores[word] = word_score
 
-            print()
-            print(f"{len(calculatedScores)} / {len(self.possible_words)} words scored")
+            log.append([[self.length, word, word_score] for word, word_score in zip(words, word_scores)])
+            words_scored += len(words)
 
             fraction_done = len(calculatedScores) / len(self.possible_words)
-            print(f"{round(fraction_done * 100, 1)}% of words scored")
+            seconds_left = (time.time() - start_time) * (len(words_to_calculate) / words_scored - 1)
+            report_progress(f"{len(calculatedScores)} / {len(self.possible_words)} words scored, "
+                            f"{round(fraction_done * 100, 1)}% of words scored, "
+                            f"{round((time.time() - start_time) / words_scored, 2)} seconds per word, "
+                            f"time left: {string_date(seconds_left)}", fraction_done)
 
-            print(f"{round((time.time() - start_time) / (word_index + 1), 2)} seconds per word")
+        # Everything in the log is now in full_scores, so the log isn't needed once they are saved
+        write_to_file(data_path(self.SCORES_FILE), full_scores)
+        log.remove()
 
-            seconds_left = (time.time() - start_time) * (len(words_to_calculate) / (word_index + 1) - 1)
-            print("Time left:", string_date(seconds_left))
+        # The starting word scores are loaded again with the new scores next time they are needed
+        _starter_scores.clear()
 
-            write_to_file("StartingWordScores.txt", full_scores)
 
-            print()
+ARTIFACT_MANIFEST_FILE = "Artifacts.json"
 
+# Changed when the artifacts are made differently, so they are all built again
+ARTIFACT_BUILD_VERSION = 3
 
-if __name__ == "__main__":
-    me = WordleOptimalPlayer(5)
+# The best first guess when there's no artifact manifest entry for 5 letter words
+DEFAULT_START_WORDS = {5: "LARES"}
+
+# The artifact manifest, loaded by get_artifact_manifest
+_artifact_manifest = None
+
+
+def get_artifact_manifest():
+    """Returns the artifact manifest made by build_artifacts, loading it the first time, or {} if there isn't one"""
+    global _artifact_manifest
+    if _artifact_manifest is None:
+        _artifact_manifest = {}
+        if os.path.exists(data_path(ARTIFACT_MANIFEST_FILE)):
+            manifest = read_from_file(data_path(ARTIFACT_MANIFEST_FILE))
+            if manifest.get("version") == ARTIFACT_BUILD_VERSION:
+                _artifact_manifest = manifest
+
+    return _artifact_manifest
+
+
+def get_artifact_entry(length):
+    """
+    Returns what was built for a word length from the artifact manifest, or None if it wasn't built or was built
+    from a different list of words
+    """
+    entry = get_artifact_manifest().get("lengths", {}).get(str(length))
+    if entry is None or entry["digest"] != get_letter_index(length, get_lexicon().words(length)).digest.hex():
+        return None
+
+    return entry
+
+
+def get_best_start_word(length):
+    """Returns the best first guess for a word length, or None if it isn't known"""
+    entry = get_artifact_entry(length)
+    if entry is not None and entry["best_start_word"] is not None:
+        return entry["best_start_word"]
+
+    return DEFAULT_START_WORDS.get(length)
+
+
+def artifact_inputs(length, words, depth):
+    """Returns a hash of everything the artifacts of a word length are made from, so unchanged ones can be skipped"""
+    # The opening book is played with the answers from the answers file, so it has to be built again if they change
+    answers = sorted((get_lexicon().answers(length) or {}).items())
+
+    inputs = [ARTIFACT_BUILD_VERSION, length, words_digest(words).hex(), depth, PatternMatrix.MAGIC.decode(),
+              Lexicon.MAGIC.decode(), OpeningBook.VERSION, answers]
+    return hashlib.sha256(json.dumps(inputs).encode()).hexdigest()
+
+
+def build_length_artifacts(length, depth=2, print_progress=True, workers=1):
+    """
+    Builds the artifacts of one word length: the binary word list, the PatternMatrix, the score of every first guess
+    and the opening book. If the matrix is too big, the first guesses are scored with a FeedbackKernel instead, split
+    between workers processes. Returns the manifest entry for the length, and the scores of every first guess
+    """
+    lexicon = get_lexicon()
+    words = lexicon.words(length)
+    lexicon.save_binary(length)
+
+    entry = {
+        "inputs": artifact_inputs(length, words, depth),
+        "digest": words_digest(words).hex(),
+        "words": len(words),
+        "lexicon": LEXICON_FILE.format(length),
+        "pattern_matrix": None,
+        "opening_book": None,
+        "best_start_word": None
+    }
+
+    patterns = get_pattern_matrix(length, words, print_progress)
+    if patterns is not None:
+        entry["pattern_matrix"] = PATTERN_MATRIX_FILE.format(length)
+
+        with _stats.timer("build.starter_scores"):
+            scores = dict(zip(words, patterns.score_all(range(len(words)), None, print_progress)))
+    else:
+        # Every word is a possible wordle and they are all as likely, whatever the answers file has in it, so
+        # analise_word_v2 gets the results of each guess against every word from one row of the FeedbackKernel
+        player = WordlePlayer(length, workers, answers=words)
+
+        with _stats.timer("build.starter_scores"):
+            if workers > 1:
+                scores = player.analise_parallel(words, "analise_word_v2", print_progress)
+            else:
+                scores = {}
+                t = time.time()
+                for word in words:
+                    scores[word] = player.analise_word_v2(word, print_progress=False)
+
+                    if print_progress and t + 5 < time.time():
+                        t = time.time()
+                        fraction_done = len(scores) / len(words)
+                        report_progress(f"{round(fraction_done * 100, 1)}% of first guesses scored", fraction_done)
+
+    # The opening book starts from these scores, rather then the ones in the file which might be out of date
+    _starter_scores[length] = StarterScores(length, scores)
+    entry["best_start_word"] = _starter_scores[length].top(1)[0][0]
+
+    if depth > 0:
+        with _stats.timer("build.opening_book"):
+            book = OpeningBook.build(length, depth, print_progress)
+
+        book.save()
+        _opening_books.pop(length, None)
+        entry["opening_book"] = OPENING_BOOK_FILE.format(length)
+
+    return entry, scores
+
+
+def build_artifacts(lengths=None, depth=2, workers=1, force=False, print_progress=True):
+    """
+    Builds the artifacts for each word length, or every length in the word list if lengths is None, and saves the
+    artifact manifest, which players read when they start. Lengths whose words and settings haven't changed since
+    they were last built are skipped, unless force is set. Lengths are built by workers processes at the same time,
+    or if only one length needs building, the workers score its first guesses.
+
+    Returns the lengths that were built
+    """
+    lexicon = get_lexicon()
+    if lengths is None:
+        lexicon.read_words()
+        lengths = sorted([length for length, words in lexicon.words_by_length.items() if words])
+
+    manifest = dict(get_artifact_manifest())
+    manifest["version"] = ARTIFACT_BUILD_VERSION
+    manifest.setdefault("lengths", {})
+
+    to_build = []
+    for length in lengths:
+        entry = manifest["lengths"].get(str(length))
+        files = [] if entry is None else [entry[key] for key in ("lexicon", "pattern_matrix", "opening_book")
+                                          if entry[key] is not None]
+
+        if (force or entry is None or entry["inputs"] != artifact_inputs(length, lexicon.words(length), depth)
+                or not all([os.path.exists(data_path(filename)) for filename in files])):
+            to_build.append(length)
+        elif print_progress:
+            report_progress(f"Length {length} is up to date")
+
+    if not to_build:
+        return []
+
+    if os.path.exists(data_path(STARTING_WORD_SCORES_FILE)):
+        full_scores = read_from_file(data_path(STARTING_WORD_SCORES_FILE))
+    else:
+        full_scores = {}
+
+    def built_lengths():
+        # A single length is built here, so the workers can share its first guesses instead
+        if workers <= 1 or len(to_build) == 1:
+            for length in to_build:
+                yield length, build_length_artifacts(length, depth, print_progress, workers)
+            return
+
+        import concurrent.futures
+
+        with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+            futures = {pool.submit(build_length_artifacts, length, depth, False): length for length in to_build}
+            for future in concurrent.futures.as_completed(futures):
+                yield futures[future], future.result()
+
+    for length, (entry, scores) in built_lengths():
+        if scores:
+            full_scores[str(length)] = scores
+        else:
+            full_scores.pop(str(length), None)
+
+        manifest["lengths"][str(length)] = entry
+
+        # Saved after each length, so the lengths that are done are kept if the build is stopped
+        write_to_file(data_path(STARTING_WORD_SCORES_FILE), full_scores)
+        write_to_file(data_path(ARTIFACT_MANIFEST_FILE), manifest)
+
+        if print_progress:
+            report_progress(f"Built length {length}", len(manifest["lengths"]) / len(lengths))
+
+    global _artifact_manifest
+    _artifact_manifest = None
+    _starter_scores.clear()
+
+    return to_build
+
+
+class SolverServer:
+    """
+    Answers requests for the best guesses, one JSON object per line, and keeps the word lists, pattern matrices,
+    opening books and analysis cache in memory between them, so each request doesn't have to load them again.
+    Requests are read from stdin or from connections to a Unix socket, and many can be waiting at once.
+
+    A request looks like {"id": 1, "length": 5, "history": "LARES:RYRRG,TONIC:RRRRR"}. The history can also be a
+    list of [guess, result] pairs, and the request can have a "time_budget" in seconds for the analysis, and set
+    "hard_mode" to true for games played in hard mode. The answer has the same id, and either the best guesses or an
+    error. Many games can be sent in one request as a list of "games", which are analysed together with
+    get_best_guesses_batch. A request with "stats" set to true is answered with the counters and timers from
+    get_stats, for keeping an eye on the server.
+
+    The analysis is done one request at a time on its own thread, so requests are still read while it works. With
+    more then one worker, the scoring is split up between worker processes
+    """
+
+    def __init__(self, workers=1):
+        self.workers = workers
+
+        # The thread the analysis is done on, started by serve. solve can be called without it
+        self.executor = None
+
+    def warm_up(self, lengths=()):
+        """
+        Loads everything needed to answer requests for these word lengths, or every length in the artifact manifest
+        if none are given, so the first requests are quick
+        """
+        if not lengths:
+            lengths = [int(length) for length in get_artifact_manifest().get("lengths", {})]
+
+        for length in lengths:
+            player = WordlePlayer(length, self.workers)
+            player.get_patterns(False)
+            get_opening_book(length, player.possible_words)
+
+    def player_for(self, request):
+        """Returns a player that has made the guesses in the history of a request"""
+        if not isinstance(request, dict):
+            raise ValueError("Each game must be a JSON object")
+
+        length = int(request.get("length", 5))
+        if not get_lexicon().words(length):
+            raise ValueError(f"There are no words of length {length}")
+
+        history = request.get("history", [])
+        if isinstance(history, str):
+            history = history_from_key(history)
+
+        player = WordlePlayer(length, self.workers, bool(request.get("hard_mode", False)))
+        for guess, result in history:
+            if isinstance(result, str):
+                result = string_to_result(result)
+
+            check_guess(guess, result, length)
+            player.narrow_possible_wordles(guess, result)
+
+        if not player.possible_wordles:
+            raise ValueError("No words match the history")
+
+        return player
+
+    @staticmethod
+    def answer_for(player, best_guesses):
+        """Returns the answer for a player, as a dictionary"""
+        answer = {
+            "possible_wordles": len(player.possible_wordles),
+            "best_guesses": [[word, score] for word, score in best_guesses[0]],
+            "best_wordles": [[word, score] for word, score in best_guesses[1]]
+        }
+
+        if len(player.possible_wordles) <= 10:
+            answer["wordles"] = player.possible_wordles
+
+        if player.coverage is not None:
+            answer["coverage"] = player.coverage
+
+        return answer
+
+    def solve(self, request):
+        """
+        Returns the answer to a request, as a dictionary. A request with a list of "games", each like a request on its
+        own, is answered with a list of "answers" in the same order, which are all worked out together
+        """
+        if request.get("stats"):
+            return {"stats": get_stats().snapshot(), "analysis_cache": get_analysis_cache().stats()}
+
+        if "games" in request:
+            if not isinstance(request["games"], list):
+                raise ValueError("games must be a list of games")
+
+            players = [self.player_for(game) for game in request["games"]]
+            best_guesses = get_best_guesses_batch(players, print_progress=False)
+            return {"answers": [self.answer_for(player, guesses) for player, guesses in zip(players, best_guesses)]}
+
+        player = self.player_for(request)
+        best_guesses = player.get_best_guesses(print_progress=False, time_budget=request.get("time_budget"))
+
+        return self.answer_for(player, best_guesses)
+
+    async def answer(self, line):
+        """Returns the answer to one line of JSON, as a dictionary"""
+        import asyncio
+
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("Requests must be JSON objects")
+
+            request_id = request.get("id")
+            answer = await asyncio.get_running_loop().run_in_executor(self.executor, self.solve, request)
+
+        except (ValueError, KeyError, TypeError) as error:
+            answer = {"error": str(error)}
+
+        # Anything else is still answered, so one bad request can't stop the server or leave a client waiting
+        except Exception as error:
+            answer = {"error": f"Couldn't answer the request: {error!r}"}
+
+        return {"id": request_id, **answer}
+
+    async def respond(self, line, writer=None):
+        """Answers one line, writing the answer to writer, or to stdout if writer is None"""
+        data = (json.dumps(await self.answer(line)) + "\n").encode()
+
+        if writer is None:
+            sys.stdout.buffer.write(data)
+            sys.stdout.buffer.flush()
+        else:
+            writer.write(data)
+            await writer.drain()
+
+    async def serve_connection(self, reader, writer):
+        """Answers every line sent on a connection to the socket, as each answer is ready"""
+        import asyncio
+
+        tasks = set()
+        try:
+            async for line in reader:
+                if line.strip():
+                    task = asyncio.create_task(self.respond(line, writer))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+
+            await asyncio.gather(*tasks)
+
+        except ConnectionError:
+            pass
+
+        finally:
+            writer.close()
+
+    async def serve_stdin(self):
+        """Answers every line from stdin, as each answer is ready, until stdin is closed"""
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        tasks = set()
+
+        # stdin is read on another thread, as it might be a file, which asyncio can't wait on
+        while True:
+            line = await loop.run_in_executor(None, sys.stdin.buffer.readline)
+            if not line:
+                break
+
+            if line.strip():
+                task = asyncio.create_task(self.respond(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+        await asyncio.gather(*tasks)
+
+    async def serve_socket(self, path):
+        """Answers requests sent to a Unix socket at path, until stopped"""
+        import asyncio
+        import signal
+        import stat
+
+        # Removes the socket left behind by a server that didn't stop cleanly
+        if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+            os.remove(path)
+
+        server = await asyncio.start_unix_server(self.serve_connection, path)
+
+        # Stopping the server with SIGTERM still removes the socket
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+
+        try:
+            async with server:
+                await server.serve_forever()
+
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def serve(self, socket_path=None, lengths=()):
+        """Starts answering requests, from a Unix socket if socket_path is given and from stdin otherwise"""
+        import asyncio
+        import concurrent.futures
+
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self.warm_up(lengths)
+
+        try:
+            if socket_path is None:
+                asyncio.run(self.serve_stdin())
+            else:
+                asyncio.run(self.serve_socket(socket_path))
+
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            pass
+
+        finally:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def play(hard_mode=False):
+    """Asks the user for their guesses and the results, and shows the best guesses, for games of 5 letter wordle"""
+    me = WordleOptimalPlayer(5, hard_mode=hard_mode)
     print("Key:")
     print("G: green tile,  Y: yellow tile,  R: grey tile")
     while True:
         me.start()
         print("Restarting...")
+
+
+def suggest(length=None, history="", hard_mode=False, batch=False, time_budget=None, workers=1):
+    """
+    Prints the best guesses for a game as a line of json, in the same format as the answers from SolverServer, without
+    asking anything, so it can be used from scripts. history is the guesses and results so far in the format made by
+    history_key, and the word length is the length of the first guess if it isn't given, or 5 with no guesses.
+
+    With batch set, the history of a game is read from each line of stdin instead, and each answer is printed as soon
+    as it is worked out. A line can also be a JSON request like the ones SolverServer answers. Returns the number of
+    games that had an error
+    """
+    server = SolverServer(workers)
+    errors = 0
+
+    for line in sys.stdin if batch else [history]:
+        line = line.strip()
+        if batch and not line:
+            continue
+
+        answer = {}
+        try:
+            if line.startswith("{"):
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("Requests must be JSON objects")
+
+                answer["id"] = request.get("id")
+            else:
+                answer["history"] = line
+                request = {
+                    "length": length or (len(line.split(":")[0].strip()) if line else 5),
+                    "history": line,
+                    "hard_mode": hard_mode,
+                    "time_budget": time_budget
+                }
+
+            answer.update(server.solve(request))
+
+        except (ValueError, KeyError, TypeError) as error:
+            answer["error"] = str(error)
+            errors += 1
+
+        # Anything else is an error for this line only, so the rest of the batch is still answered
+        except Exception as error:
+            answer["error"] = f"Couldn't answer the request: {error!r}"
+            errors += 1
+
+        print(json.dumps(answer), flush=True)
+
+    return errors
+
+
+def shard_argument(text):
+    """Turns a shard given on the command line, eg. 2/8, into an index and count for replay_log"""
+    import argparse
+
+    try:
+        index, count = [int(part) for part in text.split("/")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{text} isn't a shard like 2/8")
+
+    if not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"the shard index has to be from 0 to {count - 1}")
+
+    return index, count
+
+
+def main(argv=None):
+    """Runs the command given on the command line. With no command, it plays interactively"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Finds the best guesses for games of wordle")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="profile the command with cProfile, saving it to FILE (only the main thread is profiled, "
+                             "so for serve use a stats request instead)")
+    commands = parser.add_subparsers(dest="command")
+
+    play_parser = commands.add_parser("play", help="find the best guesses for a game interactively (the default)")
+    play_parser.add_argument("--hard", action="store_true", help="only suggest guesses that match every hint")
+
+    serve_parser = commands.add_parser("serve", help="answer JSON line requests for the best guesses")
+    serve_parser.add_argument("--socket", help="path of a Unix socket to listen on, instead of reading stdin")
+    serve_parser.add_argument("--workers", type=int, default=1, help="number of worker processes for scoring")
+    serve_parser.add_argument("--length", type=int, action="append", default=[],
+                              help="word length to load before answering requests, can be given more then once "
+                                   "(default: every length that has been built)")
+
+    suggest_parser = commands.add_parser("suggest", help="print the best guesses for a game as json, without asking "
+                                                          "anything (run build first so it starts quickly)")
+    suggest_parser.add_argument("--length", type=int,
+                                help="word length (default: the length of the first guess, or 5 with no guesses)")
+    suggest_parser.add_argument("--history", default="",
+                                help="the guesses and results so far, eg. LARES:RYRRG,TONIC:RRRRR")
+    suggest_parser.add_argument("--hard", action="store_true", help="only suggest guesses that match every hint")
+    suggest_parser.add_argument("--batch", action="store_true",
+                                help="read the history of a game from each line of stdin, and print the answer to each")
+    suggest_parser.add_argument("--time-budget", type=float, help="most seconds to spend analysing each game")
+    suggest_parser.add_argument("--workers", type=int, default=1, help="number of worker processes for scoring")
+
+    build_parser = commands.add_parser("build", help="build the files that make each word length quick to start")
+    build_parser.add_argument("--length", type=int, action="append",
+                              help="word length to build, can be given more then once (default: every length)")
+    build_parser.add_argument("--depth", type=int, default=2, help="number of guesses in the opening books")
+    build_parser.add_argument("--workers", type=int, default=1,
+                              help="number of lengths to build at the same time, or of processes scoring one length")
+    build_parser.add_argument("--force", action="store_true", help="build lengths that are already up to date")
+
+    replay_parser = commands.add_parser("replay", help="replay a log of games, and score each guess against the best")
+    replay_parser.add_argument("log", help="file with one game a line, eg. LARES:RYRRG,TONIC:RRRRR")
+    replay_parser.add_argument("--output", help="file to write the record of each turn to (default: stdout)")
+    replay_parser.add_argument("--hard", action="store_true", help="the games were played in hard mode")
+    replay_parser.add_argument("--workers", type=int, default=1, help="number of worker processes replaying games")
+    replay_parser.add_argument("--shard", type=shard_argument, metavar="I/N",
+                               help="only replay the games on every Nth line, starting from line I")
+
+    args = parser.parse_args(argv)
+
+    with profiling(args.profile) if args.profile else contextlib.nullcontext():
+        if args.command == "serve":
+            SolverServer(args.workers).serve(args.socket, args.length)
+        elif args.command == "suggest":
+            if suggest(args.length, args.history, args.hard, args.batch, args.time_budget, args.workers):
+                sys.exit(1)
+        elif args.command == "build":
+            build_artifacts(args.length, args.depth, args.workers, args.force)
+        elif args.command == "replay":
+            summary = replay_log(args.log, args.output, args.hard, args.workers, args.shard)
+            print(json.dumps(summary), file=sys.stderr)
+        else:
+            play(getattr(args, "hard", False))
+
+
+if __name__ == "__main__":
+    main()